@@ -3,19 +3,90 @@
 Command Line Interface for Airdrop Simulation Tool.
 """
 import click
+import csv
+import functools
+import hashlib
+import multiprocessing
+import os
 import time
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from pathlib import Path
 from typing import Optional, List, Dict, Any
 import json
 
+try:
+    import orjson
+except ImportError:  # optional speedup, see the "fast" extra
+    orjson = None
+
 from config import INITIAL_TOKENS, INITIAL_PRICE, NUM_USERS, SIMULATION_STEPS, MAX_STRATEGIES
 from strategies import AIRDROP_PARAMETER_GRID, generate_airdrop_strategies
-from simulation import run_simulation
+from simulation import init_strategy_worker, run_strategy
 from logger import setup_logging
 from validation import ValidationError
 from visualization import generate_comprehensive_report
 
+# Per-strategy summary columns written to the results Parquet file; histories go to the npz
+_RESULT_SCHEMA = pa.schema([
+    ("airdrop_strategy_name", pa.string()),
+    ("final_price", pa.float64()),
+    ("final_supply", pa.float64()),
+    ("strategy_type", pa.string()),
+    ("vesting_type", pa.string()),
+    ("percentage", pa.float64()),
+])
+_SUMMARY_COLUMNS = ['airdrop_strategy_name', 'final_price', 'final_supply']
+# Rows buffered per Parquet row group while streaming results
+_PARQUET_BATCH_ROWS = 64
+# Part of the strategy cache key; bump whenever generate_airdrop_strategies() output changes so
+# caches written by older versions are not reused
+_STRATEGY_CACHE_VERSION = 2
+
+
+def _read_json(path: str) -> Any:
+    """Load a JSON file, using orjson when it is installed."""
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def _dumps_json(data: Any, indent: bool = True) -> bytes:
+    """Serialize data to UTF-8 JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY | (orjson.OPT_INDENT_2 if indent else 0))
+    return json.dumps(data, indent=2 if indent else None).encode()
+
+
+def _write_json(data: Any, path: str, indent: bool = True) -> None:
+    """Write data to a JSON file, using orjson when it is installed."""
+    with open(path, 'wb') as f:
+        f.write(_dumps_json(data, indent))
+
+
+def _load_strategies(max_strategies: int, cache_dir: str, use_cache: bool = True) -> List[Dict[str, Any]]:
+    """
+    Generate airdrop strategies, reusing a previous run's strategies for the same grid.
+
+    Strategies are cached as JSON in cache_dir, keyed by a hash of the cache version, parameter
+    grid and max_strategies, so repeated runs compare the same strategy set.
+    """
+    key = hashlib.sha1(repr((_STRATEGY_CACHE_VERSION, AIRDROP_PARAMETER_GRID, max_strategies)).encode()).hexdigest()
+    cache_file = Path(cache_dir) / f".strategies_{key}.json"
+
+    if use_cache and cache_file.exists():
+        return _read_json(cache_file)
+
+    strategies = generate_airdrop_strategies(AIRDROP_PARAMETER_GRID, max_strategies)
+    if use_cache:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        _write_json(strategies, cache_file, indent=False)
+    return strategies
+
 
 @click.group()
 @click.version_option("1.0.0")
@@ -33,8 +104,11 @@ def cli():
 @click.option('--log-level', default='INFO', type=click.Choice(['DEBUG', 'INFO', 'WARNING', 'ERROR'], case_sensitive=False), help='Logging level')
 @click.option('--output-dir', default='results/', type=click.Path(), help='Output directory for results')
 @click.option('--config-file', type=click.Path(exists=True), help='JSON configuration file')
+@click.option('--workers', default=None, type=click.IntRange(min=1), help='Number of worker processes (default: CPU count)')
+@click.option('--no-cache', is_flag=True, help='Regenerate strategies instead of reusing cached ones')
 def run(num_users: int, steps: int, initial_tokens: int, initial_price: float,
-        max_strategies: int, log_level: str, output_dir: str, config_file: Optional[str]):
+        max_strategies: int, log_level: str, output_dir: str, config_file: Optional[str],
+        workers: Optional[int], no_cache: bool):
     """Run the airdrop simulation with specified parameters."""
 
     # Setup logging
@@ -43,13 +117,12 @@ def run(num_users: int, steps: int, initial_tokens: int, initial_price: float,
     try:
         # Load config file if provided
         if config_file:
-            with open(config_file, 'r') as f:
-                config = json.load(f)
-                num_users = config.get('num_users', num_users)
-                steps = config.get('steps', steps)
-                initial_tokens = config.get('initial_tokens', initial_tokens)
-                initial_price = config.get('initial_price', initial_price)
-                max_strategies = config.get('max_strategies', max_strategies)
+            config = _read_json(config_file)
+            num_users = config.get('num_users', num_users)
+            steps = config.get('steps', steps)
+            initial_tokens = config.get('initial_tokens', initial_tokens)
+            initial_price = config.get('initial_price', initial_price)
+            max_strategies = config.get('max_strategies', max_strategies)
 
         click.echo(f"🚀 Starting Airdrop Simulation")
         click.echo(f"   Users: {num_users}")
@@ -62,66 +135,96 @@ def run(num_users: int, steps: int, initial_tokens: int, initial_price: float,
 
         # Generate strategies
         with click.progressbar(length=max_strategies, label='Generating strategies') as bar:
-            AIRDROP_STRATEGIES = generate_airdrop_strategies(AIRDROP_PARAMETER_GRID, max_strategies)
+            AIRDROP_STRATEGIES = _load_strategies(max_strategies, output_dir, use_cache=not no_cache)
             bar.update(max_strategies)
 
         click.echo(f"✅ Generated {len(AIRDROP_STRATEGIES)} strategies")
 
         # Run simulations
         all_results: List[Dict[str, Any]] = []
+        price_hist = sent_hist = np.empty((0, 0), dtype=np.float32)
+        best_result: Optional[Dict[str, Any]] = None
         start_time: float = time.time()
 
-        with click.progressbar(AIRDROP_STRATEGIES, label='Running simulations') as bar:
-            for airdrop_strategy in bar:
-                try:
-                    params = {
-                        'num_users': num_users,
-                        'simulation_steps': steps,
-                        'initial_tokens': initial_tokens,
-                        'initial_price': initial_price,
-                        'market_sentiment': 0.0,
-                        'airdrop_strategy': airdrop_strategy
-                    }
-
-                    price_history, final_supply, market_sentiment_history = run_simulation(params)
-
-                    result: Dict[str, Any] = {
-                        "airdrop_strategy_name": airdrop_strategy["name"],
-                        "final_price": price_history[-1] if price_history else 0.0,
-                        "price_history": price_history,
-                        "final_supply": final_supply,
-                        "market_sentiment_history": market_sentiment_history,
-                        "strategy_details": str(airdrop_strategy)
-                    }
+        base_params = {
+            'num_users': num_users,
+            'simulation_steps': steps,
+            'initial_tokens': initial_tokens,
+            'initial_price': initial_price,
+            'market_sentiment': 0.0
+        }
+
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+        strategies_path = f"{output_dir}/strategies.json"
+        strategies_by_name = {strategy['name']: strategy for strategy in AIRDROP_STRATEGIES}
+        _write_json(strategies_by_name, strategies_path)
+        results_path = f"{output_dir}/airdrop_simulation_results.parquet"
+        summary_path = f"{output_dir}/airdrop_simulation_summary.csv"
+
+        # Summary rows are streamed to disk as strategies finish rather than collected into one
+        # DataFrame at the end
+        pending_rows: List[Dict[str, Any]] = []
+        with pq.ParquetWriter(results_path, _RESULT_SCHEMA, compression="zstd", compression_level=1) as writer, \
+                open(summary_path, 'w', newline='') as summary_file:
+            summary_writer = csv.DictWriter(summary_file, fieldnames=_SUMMARY_COLUMNS, extrasaction='ignore')
+            summary_writer.writeheader()
+
+            # Strategies are independent, so simulate them in parallel
+            with multiprocessing.Pool(processes=workers or os.cpu_count(), initializer=init_strategy_worker) as pool, \
+                    click.progressbar(length=len(AIRDROP_STRATEGIES), label='Running simulations') as bar:
+                for result in pool.imap_unordered(functools.partial(run_strategy, base_params=base_params), AIRDROP_STRATEGIES):
+                    bar.update(1)
+                    if "error" in result:
+                        click.echo(f"❌ Error in strategy {result['airdrop_strategy_name']}: {result['error']}", err=True)
+                        continue
+
+                    # Every strategy runs for the same steps, so histories are rows of one typed array
+                    if not all_results:
+                        price_hist = np.empty((len(AIRDROP_STRATEGIES), len(result["price_history"])), dtype=np.float32)
+                        sent_hist = np.empty_like(price_hist)
+                    row = len(all_results)
+                    price_hist[row] = result["price_history"]
+                    sent_hist[row] = result["market_sentiment_history"]
+                    result["price_history"] = price_hist[row]
+                    result["market_sentiment_history"] = sent_hist[row]
                     all_results.append(result)
 
-                except Exception as e:
-                    click.echo(f"❌ Error in strategy {airdrop_strategy['name']}: {str(e)}", err=True)
-                    continue
+                    if best_result is None or result["final_price"] > best_result["final_price"]:
+                        best_result = result
+
+                    summary_writer.writerow(result)
+                    pending_rows.append(result)
+                    if len(pending_rows) >= _PARQUET_BATCH_ROWS:
+                        writer.write_table(pa.Table.from_pylist(pending_rows, schema=_RESULT_SCHEMA))
+                        pending_rows.clear()
+
+            if pending_rows:
+                writer.write_table(pa.Table.from_pylist(pending_rows, schema=_RESULT_SCHEMA))
 
         end_time: float = time.time()
         total_duration = end_time - start_time
 
-        # Save results
-        Path(output_dir).mkdir(parents=True, exist_ok=True)
-        df = pd.DataFrame(all_results)
-        csv_path = f"{output_dir}/airdrop_simulation_results.csv"
-        df.to_csv(csv_path, index=False)
+        # Histories are stored row-aligned with the results table
+        histories_path = f"{output_dir}/airdrop_simulation_results_histories.npz"
+        np.savez_compressed(histories_path, price=price_hist[:len(all_results)], sentiment=sent_hist[:len(all_results)])
 
         # Generate visualizations
         click.echo("📊 Generating visualizations...")
         generate_comprehensive_report(all_results, output_dir)
 
         # Display results
-        if all_results:
-            best_strategy = df.loc[df['final_price'].idxmax()]
+        if best_result is not None:
+            best_strategy = best_result
             click.echo(f"\n🏆 Best Strategy: {best_strategy['airdrop_strategy_name']}")
             click.echo(f"   Final Price: ${best_strategy['final_price']:.4f}")
             click.echo(f"   Final Supply: {best_strategy['final_supply']:,.0f}")
             click.echo(f"   Improvement: {((best_strategy['final_price'] - initial_price) / initial_price * 100):.1f}%")
 
         click.echo(f"\n✅ Simulation completed in {total_duration:.1f} seconds")
-        click.echo(f"   Results saved to: {csv_path}")
+        click.echo(f"   Results saved to: {results_path}")
+        click.echo(f"   Histories: {histories_path}")
+        click.echo(f"   Strategies: {strategies_path}")
+        click.echo(f"   Summary table: {summary_path}")
         click.echo(f"   Interactive dashboard: {output_dir}/interactive_dashboard.html")
         click.echo(f"   Summary report: {output_dir}/summary_report.txt")
 
@@ -142,9 +245,19 @@ def visualize(results_file: str, output_dir: str):
     try:
         click.echo(f"📊 Generating visualizations from {results_file}")
 
-        # Load results
-        df = pd.read_csv(results_file)
-        results = df.to_dict('records')
+        # Load results (Parquet from current runs, CSV from older ones)
+        if Path(results_file).suffix == '.parquet':
+            results = pq.read_table(results_file).to_pylist()
+        else:
+            results = pd.read_csv(results_file).to_dict('records')
+
+        # Reattach the row-aligned histories saved next to Parquet results
+        histories_file = Path(results_file).with_name(f"{Path(results_file).stem}_histories.npz")
+        if histories_file.exists():
+            with np.load(histories_file) as histories:
+                for result, price_history, sentiment_history in zip(results, histories['price'], histories['sentiment']):
+                    result['price_history'] = price_history
+                    result['market_sentiment_history'] = sentiment_history
 
         # Generate visualizations
         generate_comprehensive_report(results, output_dir)
@@ -168,6 +281,7 @@ def generate_strategies(num_strategies: int, output_file: str):
     try:
         click.echo(f"🔧 Generating {num_strategies} example strategies")
 
+        # Fresh examples each time; no cache file is left next to the output
         strategies = generate_airdrop_strategies(AIRDROP_PARAMETER_GRID, num_strategies)
 
         # Display strategies
@@ -184,8 +298,7 @@ def generate_strategies(num_strategies: int, output_file: str):
                 click.echo(f"   Criteria: {strategy.get('criteria', 'N/A')}")
 
         # Save to file
-        with open(output_file, 'w') as f:
-            json.dump(strategies, f, indent=2)
+        _write_json(strategies, output_file)
 
         click.echo(f"\n✅ Strategies saved to {output_file}")
 
@@ -200,12 +313,11 @@ def validate_config(config_file: str):
     """Validate a configuration file."""
 
     try:
-        with open(config_file, 'r') as f:
-            config = json.load(f)
+        config = _read_json(config_file)
 
         click.echo(f"✅ Configuration file {config_file} is valid")
         click.echo("\nConfiguration:")
-        click.echo(json.dumps(config, indent=2))
+        click.echo(_dumps_json(config).decode())
 
     except json.JSONDecodeError as e:
         click.echo(f"❌ Invalid JSON in {config_file}: {e}", err=True)
@@ -242,8 +354,7 @@ def create_config_template(config_template: str):
     }
 
     try:
-        with open(config_template, 'w') as f:
-            json.dump(template, f, indent=2)
+        _write_json(template, config_template)
 
         click.echo(f"✅ Configuration template created: {config_template}")
         click.echo("\nEdit this file to customize your simulation parameters.")
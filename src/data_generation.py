@@ -14,11 +14,25 @@ appropriate airdrop amounts based on the specified strategy parameters.
 """
 
 import numpy as np
+from numba import njit
 from config import INITIAL_TOKENS
-from typing import Tuple, Dict, Any
+from typing import Tuple, Dict, Any, Optional
 
 # --- Data Generation ---
-def generate_user_data(num_users: int, airdrop_strategy: Dict[str, Any], user_params: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+@njit(fastmath=True, cache=True)
+def _tiered_eligibility(criteria_values: np.ndarray, thresholds: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Sums, per user, the weights of every threshold met. Thresholds must be sorted ascending."""
+    eligibility = np.zeros(criteria_values.shape[0], dtype=np.float32)
+    for i in range(criteria_values.shape[0]):
+        total = 0.0
+        for j in range(thresholds.shape[0]):
+            if criteria_values[i] < thresholds[j]:
+                break
+            total += weights[j]
+        eligibility[i] = total
+    return eligibility
+
+def generate_user_data(num_users: int, airdrop_strategy: Dict[str, Any], user_params: np.ndarray, rng: Optional[np.random.Generator] = None) -> Tuple[np.ndarray, np.ndarray]:
     """
     Generates user data including initial holdings, activity, and airdrop distribution.
 
@@ -26,46 +40,56 @@ def generate_user_data(num_users: int, airdrop_strategy: Dict[str, Any], user_pa
         num_users (int): The number of users to generate data for.
         airdrop_strategy (Dict[str, Any]): A dictionary defining the airdrop strategy.
         user_params (Dict[str, Any]): A dictionary containing user parameters.
+        rng (Optional[np.random.Generator]): Random generator to draw from. A fresh one is created if None.
 
     Returns:
-        Tuple[np.ndarray, np.ndarray]: A tuple containing the airdrop distribution and user activity.
+        Tuple[np.ndarray, np.ndarray]: A tuple containing the airdrop distribution and user activity,
+            both float32.
     """
-    initial_holdings = np.zeros(num_users)
-    user_activity = np.random.poisson(lam=20.0, size=num_users).astype(np.float32)
-    user_activity = user_activity + np.random.uniform(low=0, high=5, size=num_users)
+    if rng is None:
+        rng = np.random.default_rng()
+
+    initial_holdings = np.zeros(num_users, dtype=np.float32)
+    user_activity = rng.poisson(lam=20.0, size=num_users).astype(np.float32)
+    user_activity += rng.uniform(low=0, high=5, size=num_users)
 
     airdrop_amount = INITIAL_TOKENS * airdrop_strategy["percentage"]
 
     if airdrop_strategy["type"] == "none":
-        eligibility = np.zeros(num_users)
+        eligibility = np.zeros(num_users, dtype=np.float32)
     elif airdrop_strategy["type"] == "uniform":
-        eligibility = np.ones(num_users)
+        eligibility = np.ones(num_users, dtype=np.float32)
     elif airdrop_strategy["type"] == "tiered":
         criteria_map = {
             'holdings': initial_holdings,
             'activity': user_activity
         }
-        criteria_values = criteria_map.get(airdrop_strategy.get('criteria', 'none'), 0)
+        criteria_values = criteria_map.get(airdrop_strategy.get('criteria', 'none'), initial_holdings)
 
-        # Vectorized threshold checks
+        # Single pass over users; sorting lets each user stop at the first unmet threshold
         thresholds = np.array(airdrop_strategy.get('thresholds', []), dtype=np.float32)
         weights = np.array(airdrop_strategy.get('weights', []), dtype=np.float32)
-        eligibility = (criteria_values[:, None] >= thresholds).dot(weights)
-
+        order = np.argsort(thresholds, kind='stable')
+        eligibility = _tiered_eligibility(criteria_values, thresholds[order], weights[order])
 
     elif airdrop_strategy["type"] == "lottery":
+        # Every winner gets an equal share, so scatter it straight to the winners' indices
         num_winners = int(num_users * airdrop_strategy["winners_fraction"])
-        winners = np.random.choice(num_users, size=num_winners, replace=False)
-        eligibility = np.zeros(num_users)
-        eligibility[winners] = 1
+        # Generator.choice switches to set-based sampling when there are few winners
+        winners = rng.choice(num_users, num_winners, replace=False).astype(np.int32)
+        airdrop_distribution = np.zeros(num_users, dtype=np.float32)
+        airdrop_distribution[winners] = airdrop_amount / (num_winners + 1e-8)
+        return airdrop_distribution, user_activity
     else:
-        eligibility = np.zeros(num_users)
+        eligibility = np.zeros(num_users, dtype=np.float32)
 
     total_eligibility = np.sum(eligibility)
-    airdrop_distribution = np.where(
-      eligibility > 0,
-      airdrop_amount * eligibility / (total_eligibility + 1e-8),  # Add small epsilon to avoid division by zero
-      0.0
+    airdrop_distribution = np.zeros(num_users, dtype=np.float32)
+    np.divide(
+      airdrop_amount * eligibility,
+      total_eligibility + 1e-8,  # Add small epsilon to avoid division by zero
+      out=airdrop_distribution,
+      where=eligibility > 0
     )
 
     return airdrop_distribution, user_activity
\ No newline at end of file
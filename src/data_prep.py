@@ -15,7 +15,7 @@ while maintaining the core characteristics of each archetype.
 
 import numpy as np
 from config import USER_ARCHETYPES, USER_DISTRIBUTION
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 # --- Data Preparation ---
 # --- User Archetypes Data ---
@@ -28,29 +28,44 @@ for archetype_name, params in USER_ARCHETYPES.items():
 user_archetypes_array = np.array(user_archetypes_data, dtype=np.float32)
 user_distribution_probs = [USER_DISTRIBUTION[name] for name in archetype_names]
 
-def assign_user_parameters(num_users: int) -> np.ndarray:
+# Per-parameter archetype columns (structure of arrays), contiguous for fast gathers
+_BASE_BUY = np.ascontiguousarray(user_archetypes_array[:, 0])
+_BASE_SELL = np.ascontiguousarray(user_archetypes_array[:, 1])
+_PRICE_SENSITIVITY = np.ascontiguousarray(user_archetypes_array[:, 2])
+_MARKET_INFLUENCE = np.ascontiguousarray(user_archetypes_array[:, 3])
+_ARCHETYPE_COLUMNS = (_BASE_BUY, _BASE_SELL, _PRICE_SENSITIVITY, _MARKET_INFLUENCE)
+
+def assign_user_parameters(num_users: int, rng: Optional[np.random.Generator] = None) -> np.ndarray:
     """
     Assigns user parameters based on predefined archetypes with realistic distribution.
 
     Args:
         num_users (int): The number of users to assign parameters to.
+        rng (Optional[np.random.Generator]): Random generator to draw from. A fresh one is created if None.
 
     Returns:
-        np.ndarray: An array of user parameters.
+        np.ndarray: A (num_users, 4) float32 array of user parameters, stored column-major so
+            each parameter is a contiguous vector.
     """
+    if rng is None:
+        rng = np.random.default_rng()
+
     # Use realistic user distribution instead of uniform
-    archetypes = np.random.choice(
+    archetypes = rng.choice(
         len(user_distribution_probs),
         size=num_users,
         p=user_distribution_probs
     )
-    user_params = user_archetypes_array[archetypes]
+    user_params = np.empty((num_users, 4), dtype=np.float32, order='F')
+    for column, archetype_column in enumerate(_ARCHETYPE_COLUMNS):
+        np.take(archetype_column, archetypes, out=user_params[:, column])
 
     # Add realistic noise to simulate individual variations
     noise_scale = 0.08  # Reduced noise for more realistic behavior
-    noise = np.random.normal(size=user_params.shape, scale=noise_scale)
-    user_params = user_params + noise
-    user_params = np.clip(user_params, 0.0, 1.0)
+    noise = rng.standard_normal(user_params.shape, dtype=np.float32)
+    noise *= noise_scale
+    user_params += noise
+    np.clip(user_params, 0.0, 1.0, out=user_params)
 
     return user_params
 
@@ -3,22 +3,106 @@ Helper functions module for the airdrop simulation system.
 
 This module contains utility functions that support the core simulation logic:
 
+- market_cycle_table(): Precomputes the sinusoidal market cycle component for every step of a run
 - calculate_buy_sell_probabilities(): Calculates user trading probabilities based on various factors
-  including price sensitivity, market sentiment, network effects, and market cycles
+  including price sensitivity, market sentiment, network effects, and market cycles. The per-user
+  math runs in a single Numba-compiled pass (_probability_kernel)
+- vesting_schedule(): Extracts a strategy's vesting parameters once per run
 - dynamic_vesting(): Handles different vesting mechanisms (linear, dynamic_price, dynamic_activity)
-  with proper tracking of vested amounts over time
+  with proper tracking of vested amounts over time, in a single Numba-compiled pass
 
 The functions include robust error handling and validation to ensure simulation stability
 and realistic behavior modeling.
 """
 
+import functools
+import math
+
 import numpy as np
+from numba import njit, prange
 from config import INITIAL_PRICE, SIMULATION_STEPS, INITIAL_TOKENS, MARKET_CYCLES
-from typing import Tuple, Dict, Any
-from validation import validate_user_params, safe_log, safe_divide, ValidationError
+from typing import Tuple, Dict, Any, Optional
+from validation import validate_user_params, ValidationError
 
 # --- Helper Functions ---
-def calculate_buy_sell_probabilities(user_params: np.ndarray, current_price: float, initial_price: float, market_sentiment: float, airdrop_strategy: Dict[str, Any], holdings: np.ndarray, step: int) -> Tuple[np.ndarray, np.ndarray]:
+@njit(fastmath=True, cache=True)
+def _expit(x: float) -> float:
+    """Logistic sigmoid 1 / (1 + exp(-x)), evaluated so that exp() never overflows."""
+    # One exp of -|x| serves both signs; the final select compiles without a branch
+    z = math.exp(-abs(x))
+    r = 1.0 / (1.0 + z)
+    return r if x >= 0.0 else z * r
+
+@njit(fastmath=True, cache=True)
+def _fast_log1p(x: float) -> float:
+    """
+    log(1 + x) for x > -1, accurate to float32 precision and about twice as fast as math.log1p.
+
+    Splits 1 + x into mantissa and exponent and evaluates log of the mantissa with a short
+    atanh series, which is plenty for the float32 probabilities it feeds.
+    """
+    mantissa, exponent = math.frexp(1.0 + x)
+    if mantissa < 0.7071067811865476:
+        mantissa *= 2.0
+        exponent -= 1
+    f = mantissa - 1.0
+    s = f / (2.0 + f)
+    z = s * s
+    return exponent * 0.6931471805599453 + 2.0 * s * (1.0 + z * (1.0 / 3.0 + z * (0.2 + z * (1.0 / 7.0 + z / 9.0))))
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _probability_kernel(base_buy_prob: np.ndarray, base_sell_prob: np.ndarray, price_sensitivities: np.ndarray, market_influences: np.ndarray, holdings: np.ndarray, current_price: float, initial_price: float, airdrop_price: float, market_sentiment: float, base_sell_mult: float, price_change_factor: float, network_effect: float, cycle: float, buy_prob: np.ndarray, sell_prob: np.ndarray) -> None:
+    """
+    Fused per-user buy/sell probability computation, writing into buy_prob and sell_prob.
+
+    User parameters are passed as one 1-D array per column so each is read with unit stride.
+    """
+    # Loop-invariant network scaling for sells; a zero network effect leaves sells unscaled
+    sell_network_scale = 1.0 / network_effect if network_effect != 0.0 else 1.0
+    for i in prange(base_buy_prob.shape[0]):
+        base_buy = base_buy_prob[i]
+        base_sell = base_sell_prob[i] * base_sell_mult
+        price_sensitivity = price_sensitivities[i]
+        market_influence = market_influences[i]
+
+        buy = _expit(base_buy + price_sensitivity * (initial_price - current_price) + market_influence * market_sentiment - price_change_factor * 0.5)
+        sell = _expit(base_sell - price_sensitivity * (current_price - airdrop_price) + market_influence * market_sentiment + price_change_factor * 0.3)
+
+        # Apply holdings multiplier; log1p(0) == 0, so clamping replaces the holdings > 0 branch
+        sell *= 1.0 + _fast_log1p(max(holdings[i], 0.0))
+        sell = min(1.0, max(0.0, sell))
+
+        # Add network effect multiplier
+        buy *= network_effect
+        sell *= sell_network_scale
+
+        # Add market cycle component
+        buy *= 1.0 + cycle
+        sell *= 1.0 - cycle
+
+        # Ensure probabilities are in valid range
+        buy_prob[i] = min(1.0, max(0.0, buy))
+        sell_prob[i] = min(1.0, max(0.0, sell))
+
+@functools.lru_cache(maxsize=8)
+def market_cycle_table(simulation_steps: int) -> np.ndarray:
+    """
+    Precomputes the market cycle component for every simulation step.
+
+    The schedule does not depend on the strategy, so it is computed once per step count and
+    shared (read-only) by every simulation of that length.
+
+    Args:
+        simulation_steps (int): The number of simulation steps.
+
+    Returns:
+        np.ndarray: The read-only cycle value for each step, indexed by step.
+    """
+    cycle_table = np.sin(np.arange(simulation_steps) * MARKET_CYCLES['frequency']) * MARKET_CYCLES['amplitude']
+    cycle_table.flags.writeable = False
+    return cycle_table
+
+def calculate_buy_sell_probabilities(user_params: np.ndarray, current_price: float, initial_price: float, market_sentiment: float, airdrop_strategy: Dict[str, Any], holdings: np.ndarray, cycle: float, out: Optional[Tuple[np.ndarray, np.ndarray]] = None, total_holdings: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
     """
     Calculates the buy and sell probabilities for each user.
 
@@ -29,7 +113,11 @@ def calculate_buy_sell_probabilities(user_params: np.ndarray, current_price: flo
         market_sentiment (float): The current market sentiment.
         airdrop_strategy (Dict[str, Any]): A dictionary defining the airdrop strategy.
         holdings (np.ndarray): An array of user holdings.
-        step (int): The current simulation step.
+        cycle (float): The market cycle component for the current step (see market_cycle_table()).
+        out (Optional[Tuple[np.ndarray, np.ndarray]]): Preallocated (buy, sell) arrays to write the
+            probabilities into, e.g. reused across steps. New float32 arrays are allocated if None.
+        total_holdings (Optional[float]): Sum of holdings if already known, e.g. tracked by the
+            simulation loop. Computed from holdings if None.
 
     Returns:
         Tuple[np.ndarray, np.ndarray]: A tuple containing the buy and sell probabilities.
@@ -49,51 +137,80 @@ def calculate_buy_sell_probabilities(user_params: np.ndarray, current_price: flo
 
         airdrop_price = airdrop_strategy.get("airdrop_price", initial_price)
 
-        base_buy_prob = user_params[:, 0]
-        base_sell_prob = user_params[:, 1]
-
+        base_sell_mult = 1.0
         if airdrop_strategy.get("type") == "tiered" and airdrop_strategy.get("criteria") == "holdings":
-            base_sell_prob = base_sell_prob * 0.5
-
-        price_sensitivity = user_params[:, 2]
-        market_influence = user_params[:, 3]
-
-        price_change_factor = safe_divide(current_price - initial_price, initial_price, 0.0)
-
-        exponent_buy = -(base_buy_prob + price_sensitivity * (initial_price - current_price) + market_influence * market_sentiment - price_change_factor * 0.5)
-        exponent_buy = np.clip(exponent_buy, -50, 50)
-        buy_prob = 1 / (1 + np.exp(exponent_buy))
-
-        exponent_sell = -(base_sell_prob - price_sensitivity * (current_price - airdrop_price) + market_influence * market_sentiment + price_change_factor * 0.3)
-        exponent_sell = np.clip(exponent_sell, -50, 50)
-        sell_prob = 1 / (1 + np.exp(exponent_sell))
-
-        # Apply holdings multiplier safely
-        holdings_multiplier = 1 + safe_log(holdings + 1, 0.0)
-        sell_prob = np.where(holdings > 0, sell_prob * holdings_multiplier, sell_prob)
-        sell_prob = np.clip(sell_prob, 0.0, 1.0)
-
-        # Add network effect multiplier safely
-        total_holdings = np.sum(holdings)
-        network_effect = 1 + 0.2 * safe_log(safe_divide(total_holdings, INITIAL_TOKENS, 1.0), 0.0)
-        buy_prob *= network_effect
-        sell_prob = safe_divide(sell_prob, network_effect, sell_prob)
-
-        # Add market cycle component
-        cycle = np.sin(step * MARKET_CYCLES['frequency']) * MARKET_CYCLES['amplitude']
-        buy_prob *= 1 + cycle
-        sell_prob *= 1 - cycle
-
-        # Ensure probabilities are in valid range
-        buy_prob = np.clip(buy_prob, 0.0, 1.0)
-        sell_prob = np.clip(sell_prob, 0.0, 1.0)
+            base_sell_mult = 0.5
+
+        price_change_factor = (current_price - initial_price) / initial_price
+
+        # Network effect is a per-step scalar, so hoist it out of the kernel
+        if total_holdings is None:
+            total_holdings = float(np.sum(holdings))
+        holdings_ratio = total_holdings / INITIAL_TOKENS
+        network_effect = 1.0 + 0.2 * math.log(holdings_ratio) if holdings_ratio > 0 else 1.0
+
+        if out is None:
+            buy_prob, sell_prob = np.empty(holdings.shape[0], dtype=np.float32), np.empty(holdings.shape[0], dtype=np.float32)
+        else:
+            buy_prob, sell_prob = out
+        _probability_kernel(
+            # Contiguous for the column-major arrays from assign_user_parameters()
+            user_params[:, 0], user_params[:, 1], user_params[:, 2], user_params[:, 3], holdings, float(current_price), float(initial_price), float(airdrop_price),
+            float(market_sentiment), base_sell_mult, price_change_factor, network_effect, float(cycle),
+            buy_prob, sell_prob
+        )
 
         return buy_prob, sell_prob
 
     except Exception as e:
         raise ValidationError(f"Error in calculate_buy_sell_probabilities: {str(e)}")
 
-def dynamic_vesting(holdings: np.ndarray, airdrop_per_user: np.ndarray, current_price: float, airdrop_strategy: Dict[str, Any], step: int, user_activity: np.ndarray) -> np.ndarray:
+# Vesting types as integer codes, so the vesting pass can be compiled without dict access
+_VESTING_NONE, _VESTING_LINEAR, _VESTING_DYNAMIC_PRICE, _VESTING_DYNAMIC_ACTIVITY = range(4)
+_VESTING_CODES: Dict[str, int] = {
+    "linear": _VESTING_LINEAR,
+    "dynamic_price": _VESTING_DYNAMIC_PRICE,
+    "dynamic_activity": _VESTING_DYNAMIC_ACTIVITY,
+}
+
+def vesting_schedule(airdrop_strategy: Dict[str, Any]) -> Tuple[int, int, int, float, float]:
+    """
+    Extracts a strategy's vesting parameters once, for reuse on every step of a run.
+
+    Args:
+        airdrop_strategy (Dict[str, Any]): A dictionary defining the airdrop strategy.
+
+    Returns:
+        Tuple[int, int, int, float, float]: The vesting type code, vesting periods, steps per
+            vesting period, price threshold and activity threshold.
+    """
+    vesting_periods = airdrop_strategy.get("vesting_periods", 1)
+    return (
+        _VESTING_CODES.get(airdrop_strategy.get("vesting", "none"), _VESTING_NONE),
+        vesting_periods,
+        max(1, SIMULATION_STEPS // vesting_periods),
+        float(airdrop_strategy.get("price_threshold", 0.015)),
+        float(airdrop_strategy.get("activity_threshold", 50)),
+    )
+
+@njit(cache=True)
+def _vesting_kernel(holdings: np.ndarray, airdrop_per_user: np.ndarray, user_activity: np.ndarray, vesting_code: int, vesting_periods: int, activity_threshold: float, vested_so_far: np.ndarray, out: np.ndarray) -> None:
+    """Vests this period's slice for each user, capped at what remains, writing new holdings into out."""
+    for i in range(holdings.shape[0]):
+        vested_amount = airdrop_per_user[i] / vesting_periods
+        if vesting_code == _VESTING_DYNAMIC_ACTIVITY:
+            # Scaled by activity, for users at or above the activity threshold
+            if user_activity[i] >= activity_threshold:
+                vested_amount *= user_activity[i] / activity_threshold
+            else:
+                vested_amount = 0.0
+
+        # Apply vesting cap to prevent over-vesting, and ensure non-negative
+        actual_vest = max(min(vested_amount, airdrop_per_user[i] - vested_so_far[i]), 0.0)
+        vested_so_far[i] += actual_vest
+        out[i] = holdings[i] + actual_vest
+
+def dynamic_vesting(holdings: np.ndarray, airdrop_per_user: np.ndarray, current_price: float, airdrop_strategy: Dict[str, Any], step: int, user_activity: np.ndarray, vested_so_far: np.ndarray, schedule: Optional[Tuple[int, int, int, float, float]] = None) -> np.ndarray:
     """
     Applies dynamic vesting to user holdings.
 
@@ -104,45 +221,24 @@ def dynamic_vesting(holdings: np.ndarray, airdrop_per_user: np.ndarray, current_
         airdrop_strategy (Dict[str, Any]): A dictionary defining the airdrop strategy.
         step (int): The current simulation step.
         user_activity (np.ndarray): An array of user activity levels.
+        vested_so_far (np.ndarray): Amount vested to each user so far; updated in place.
+        schedule (Optional[Tuple[int, int, int, float, float]]): The strategy's vesting_schedule(),
+            precomputed once per run. Derived from airdrop_strategy if None.
 
     Returns:
         np.ndarray: An array of updated user holdings.
     """
-    vesting_type = airdrop_strategy["vesting"]
-    vesting_periods = airdrop_strategy.get("vesting_periods", 1)
-
-    # Initialize vested_so_far if not present in strategy
-    if 'vested_so_far' not in airdrop_strategy:
-        airdrop_strategy['vested_so_far'] = np.zeros_like(holdings)
-
-    vested_so_far = airdrop_strategy['vested_so_far']
-    vested_amount = np.zeros_like(holdings)
-
-    if vesting_type == "dynamic_price":
-        price_threshold = airdrop_strategy.get("price_threshold", 0.015)
-        mask = ((step % max(1, SIMULATION_STEPS // vesting_periods)) == 0) & (current_price > price_threshold)
-        vested_amount = np.where(mask, airdrop_per_user / vesting_periods, 0.0)
-
-    elif vesting_type == "dynamic_activity":
-        activity_threshold = airdrop_strategy.get("activity_threshold", 50)
-        mask = ((step % max(1, SIMULATION_STEPS // vesting_periods)) == 0) & (user_activity >= activity_threshold)
-        vested_amount = np.where(
-            mask,
-            (user_activity / activity_threshold) * (airdrop_per_user / vesting_periods),
-            0.0
-        )
-
-    elif vesting_type == "linear":
-        mask = (step % max(1, SIMULATION_STEPS // vesting_periods)) == 0
-        vested_amount = np.where(mask, airdrop_per_user / vesting_periods, 0.0)
-
-    # Apply vesting cap to prevent over-vesting
-    remaining_vest = airdrop_per_user - vested_so_far
-    actual_vest = np.minimum(vested_amount, remaining_vest)
-    actual_vest = np.maximum(actual_vest, 0.0)  # Ensure non-negative
-
-    # Update tracking
-    vested_so_far += actual_vest
-    airdrop_strategy['vested_so_far'] = vested_so_far
-
-    return holdings + actual_vest
\ No newline at end of file
+    if schedule is None:
+        schedule = vesting_schedule(airdrop_strategy)
+    vesting_code, vesting_periods, period_steps, price_threshold, activity_threshold = schedule
+
+    # Vesting only happens at period boundaries, which is a scalar test on the step
+    if vesting_code == _VESTING_NONE or step % period_steps != 0:
+        return holdings
+    # Price-triggered vesting releases nothing while the price is at or below the threshold
+    if vesting_code == _VESTING_DYNAMIC_PRICE and current_price <= price_threshold:
+        return holdings
+
+    new_holdings = np.empty_like(holdings)
+    _vesting_kernel(holdings, airdrop_per_user, user_activity, vesting_code, vesting_periods, activity_threshold, vested_so_far, new_holdings)
+    return new_holdings
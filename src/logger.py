@@ -1,13 +1,30 @@
 """
 Logging module for airdrop simulation.
+
+Records are handed to a queue and written by a background listener thread, so formatting
+and disk I/O stay off the simulation thread.
 """
+import atexit
 import logging
 import logging.handlers
+import queue
 import sys
 from typing import Dict, Any, Optional
 import numpy as np
 from pathlib import Path
 
+# Running queue listener per logger name, stopped (and flushed) when the logger is reconfigured or at exit
+_listeners: Dict[str, logging.handlers.QueueListener] = {}
+
+
+def _stop_listeners() -> None:
+    """Stop every queue listener, flushing pending records."""
+    while _listeners:
+        _listeners.popitem()[1].stop()
+
+
+atexit.register(_stop_listeners)
+
 
 class SimulationLogger:
     """Custom logger for simulation events."""
@@ -24,8 +41,12 @@ class SimulationLogger:
         self.logger = logging.getLogger(name)
         self.logger.setLevel(level)
 
-        # Clear existing handlers
+        # Clear existing handlers, flushing records queued for them
         self.logger.handlers.clear()
+        previous_listener = _listeners.pop(name, None)
+        if previous_listener is not None:
+            previous_listener.stop()
+        handlers = []
 
         # Console handler
         console_handler = logging.StreamHandler(sys.stdout)
@@ -34,7 +55,7 @@ class SimulationLogger:
             '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
         )
         console_handler.setFormatter(console_formatter)
-        self.logger.addHandler(console_handler)
+        handlers.append(console_handler)
 
         # File handler if specified
         if log_file:
@@ -49,7 +70,14 @@ class SimulationLogger:
                 '%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s'
             )
             file_handler.setFormatter(file_formatter)
-            self.logger.addHandler(file_handler)
+            handlers.append(file_handler)
+
+        # The logger only enqueues; the listener thread formats and writes
+        log_queue: queue.Queue = queue.Queue(-1)
+        self.logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        listener.start()
+        _listeners[name] = listener
 
     def log_simulation_start(self, params: Dict[str, Any]) -> None:
         """Log the start of a simulation."""
@@ -70,7 +98,8 @@ class SimulationLogger:
 
     def log_step_info(self, step: int, price: float, total_supply: float, market_sentiment: float) -> None:
         """Log information for each simulation step."""
-        if step % 100 == 0:  # Log every 100 steps to avoid spam
+        # Log every 100 steps to avoid spam, and skip formatting when debug output is off
+        if step % 100 == 0 and self.logger.isEnabledFor(logging.DEBUG):
             self.logger.debug(f"Step {step}: Price=${price:.4f}, Supply={total_supply:.0f}, Sentiment={market_sentiment:.3f}")
 
     def log_strategy_info(self, strategy_name: str, strategy: Dict[str, Any]) -> None:
@@ -95,6 +124,9 @@ class SimulationLogger:
 
     def log_array_stats(self, name: str, array: np.ndarray) -> None:
         """Log statistics for a numpy array."""
+        # The statistics are full passes over the array; only compute them if they will be logged
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
         if array.size == 0:
             self.logger.debug(f"{name}: Empty array")
             return
@@ -5,7 +5,7 @@ This module serves as the entry point for running airdrop simulations. It handle
 
 - Command line argument parsing for simulation parameters
 - Generation of multiple airdrop strategies from parameter grids
-- Execution of simulations for each strategy
+- Execution of simulations for each strategy, in parallel across worker processes
 - Results collection, analysis, and CSV export
 - Generation of comprehensive visualization reports
 - Identification and display of the best performing strategy
@@ -15,107 +15,122 @@ and provides detailed output about simulation progress and results.
 """
 
 import argparse
+import functools
+import multiprocessing
+import os
 import time
 import pandas as pd
 from config import INITIAL_TOKENS, INITIAL_PRICE, NUM_USERS, SIMULATION_STEPS, MAX_STRATEGIES
 from strategies import AIRDROP_PARAMETER_GRID, generate_airdrop_strategies
-from simulation import run_simulation
+from simulation import init_strategy_worker, run_strategy
 from logger import get_logger, setup_logging
 from validation import ValidationError
 from visualization import generate_comprehensive_report
 from typing import List, Dict, Any, Tuple
 
-# --- Argument Parsing ---
-parser = argparse.ArgumentParser(description="Run the airdrop simulation.")
-parser.add_argument('--num_users', type=int, default=NUM_USERS, help='Number of users in the simulation')
-parser.add_argument('--steps', type=int, default=SIMULATION_STEPS, help='Number of simulation steps')
-parser.add_argument('--initial_tokens', type=int, default=INITIAL_TOKENS, help='Initial tokens per user')
-parser.add_argument('--initial_price', type=float, default=INITIAL_PRICE, help='Initial token price')
-parser.add_argument('--volatility', type=float, default=0.0, help='Price volatility factor')
-parser.add_argument('--max_strategies', type=int, default=MAX_STRATEGIES, help='Maximum number of strategies to generate')
-args = parser.parse_args()
-
-# --- Main Execution Block ---
-logger = setup_logging("logs/simulation.log", "INFO")
-
-try:
-    AIRDROP_STRATEGIES = generate_airdrop_strategies(AIRDROP_PARAMETER_GRID, args.max_strategies)
-    logger.logger.info(f"Generated {len(AIRDROP_STRATEGIES)} strategies")
-
-    all_results: List[Dict[str, Any]] = []
-    start_time: float = time.time()
-
-    for i, airdrop_strategy in enumerate(AIRDROP_STRATEGIES):
-        airdrop_name = airdrop_strategy["name"]
-        logger.log_strategy_info(airdrop_name, airdrop_strategy)
-
-        try:
-            params = {
-                'num_users': args.num_users,
-                'simulation_steps': args.steps,
-                'initial_tokens': args.initial_tokens,
-                'initial_price': args.initial_price,
-                'market_sentiment': 0.0,
-                'airdrop_strategy': airdrop_strategy
-            }
-
-            logger.log_simulation_start(params)
-            price_history, final_supply, market_sentiment_history = run_simulation(params)
-
-            result: Dict[str, Any] = {
-                "airdrop_strategy_name": airdrop_name,
-                "final_price": price_history[-1] if price_history else 0.0,
-                "price_history": price_history,
-                "final_supply": final_supply,
-                "market_sentiment_history": market_sentiment_history,
-                "strategy_details": str(airdrop_strategy)
-            }
-            all_results.append(result)
-
-            logger.log_simulation_end(time.time() - start_time, result)
-            logger.logger.info(f"Completed strategy {i+1}/{len(AIRDROP_STRATEGIES)}")
-
-        except Exception as e:
-            logger.log_error(e, f"Strategy {airdrop_name}")
-            logger.logger.error(f"Skipping strategy {airdrop_name} due to error")
-            continue
-
-    end_time: float = time.time()
-    total_duration = end_time - start_time
-    logger.logger.info(f"All simulations completed in {total_duration:.2f} seconds")
-    logger.logger.info(f"Successfully ran {len(all_results)} out of {len(AIRDROP_STRATEGIES)} strategies")
-
-except ValidationError as e:
-    logger.log_error(e, "Parameter validation")
-    print(f"Parameter validation error: {e}")
-    exit(1)
-except Exception as e:
-    logger.log_error(e, "Main execution")
-    print(f"Unexpected error: {e}")
-    exit(1)
-
-# --- Create DataFrame ---
-df = pd.DataFrame(all_results)
-
-# --- Save Results ---
-df.to_csv("airdrop_simulation_results.csv", index=False)
-logger.logger.info("Results saved to airdrop_simulation_results.csv")
-
-# --- Generate Comprehensive Report ---
-try:
-    logger.logger.info("Generating visualization report...")
-    generate_comprehensive_report(all_results, "results/")
-    logger.logger.info("Visualization report generated successfully")
-except Exception as e:
-    logger.log_error(e, "Visualization generation")
-    logger.logger.warning("Could not generate visualization report")
-
-# --- Display Best Strategy ---
-if all_results:
-    best_strategy_name = df.loc[df['final_price'].idxmax(), 'airdrop_strategy_name']
-    print(f"\nBest Strategy (Highest Final Price): {best_strategy_name}")
-    print(f"  Final Price: ${df.loc[df['final_price'].idxmax(), 'final_price']:.4f}")
-    print(f"  Final Supply: {df.loc[df['final_price'].idxmax(), 'final_supply']:.2f}")
-    print(f"  Strategy Details: {df.loc[df['final_price'].idxmax(), 'strategy_details']}")
-
-    logger.logger.info(f"Best performing strategy: {best_strategy_name} with final price ${df['final_price'].max():.4f}")
\ No newline at end of file
+# --- Argument Types ---
+def _positive_int(value: str) -> int:
+    """argparse type for counts that must be at least 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+def main() -> None:
+    """Parse arguments, run every strategy in parallel, and save and report the results."""
+    # --- Argument Parsing ---
+    parser = argparse.ArgumentParser(description="Run the airdrop simulation.")
+    parser.add_argument('--num_users', type=int, default=NUM_USERS, help='Number of users in the simulation')
+    parser.add_argument('--steps', type=int, default=SIMULATION_STEPS, help='Number of simulation steps')
+    parser.add_argument('--initial_tokens', type=int, default=INITIAL_TOKENS, help='Initial tokens per user')
+    parser.add_argument('--initial_price', type=float, default=INITIAL_PRICE, help='Initial token price')
+    parser.add_argument('--volatility', type=float, default=0.0, help='Price volatility factor')
+    parser.add_argument('--max_strategies', type=int, default=MAX_STRATEGIES, help='Maximum number of strategies to generate')
+    parser.add_argument('--workers', type=_positive_int, default=None, help='Number of worker processes (default: CPU count)')
+    args = parser.parse_args()
+
+    # --- Main Execution Block ---
+    logger = setup_logging("logs/simulation.log", "INFO")
+
+    try:
+        AIRDROP_STRATEGIES = generate_airdrop_strategies(AIRDROP_PARAMETER_GRID, args.max_strategies)
+        logger.logger.info(f"Generated {len(AIRDROP_STRATEGIES)} strategies")
+
+        all_results: List[Dict[str, Any]] = []
+        start_time: float = time.time()
+
+        base_params = {
+            'num_users': args.num_users,
+            'simulation_steps': args.steps,
+            'initial_tokens': args.initial_tokens,
+            'initial_price': args.initial_price,
+            'market_sentiment': 0.0
+        }
+        logger.log_simulation_start(base_params)
+        strategies_by_name = {strategy["name"]: strategy for strategy in AIRDROP_STRATEGIES}
+
+        # Strategies run concurrently in the pool, so each one's start is logged as it is handed
+        # to the pool, and its completion as its result comes back
+        for strategy in AIRDROP_STRATEGIES:
+            logger.log_strategy_info(strategy["name"], strategy)
+
+        # Strategies are independent, so simulate them in parallel
+        with multiprocessing.Pool(processes=args.workers or os.cpu_count(), initializer=init_strategy_worker) as pool:
+            results = pool.imap_unordered(functools.partial(run_strategy, base_params=base_params), AIRDROP_STRATEGIES)
+            for i, result in enumerate(results):
+                airdrop_name = result["airdrop_strategy_name"]
+
+                if "error" in result:
+                    logger.logger.error(f"Error in Strategy {airdrop_name}: {result['error']}")
+                    logger.logger.error(f"Skipping strategy {airdrop_name} due to error")
+                    continue
+
+                result["strategy_details"] = str(strategies_by_name[airdrop_name])
+                all_results.append(result)
+
+                logger.log_simulation_end(time.time() - start_time, result)
+                logger.logger.info(f"Completed strategy {i+1}/{len(AIRDROP_STRATEGIES)}")
+
+        end_time: float = time.time()
+        total_duration = end_time - start_time
+        logger.logger.info(f"All simulations completed in {total_duration:.2f} seconds")
+        logger.logger.info(f"Successfully ran {len(all_results)} out of {len(AIRDROP_STRATEGIES)} strategies")
+
+    except ValidationError as e:
+        logger.log_error(e, "Parameter validation")
+        print(f"Parameter validation error: {e}")
+        exit(1)
+    except Exception as e:
+        logger.log_error(e, "Main execution")
+        print(f"Unexpected error: {e}")
+        exit(1)
+
+    # --- Create DataFrame ---
+    df = pd.DataFrame(all_results)
+
+    # --- Save Results ---
+    df.to_csv("airdrop_simulation_results.csv", index=False)
+    logger.logger.info("Results saved to airdrop_simulation_results.csv")
+
+    # --- Generate Comprehensive Report ---
+    try:
+        logger.logger.info("Generating visualization report...")
+        generate_comprehensive_report(all_results, "results/")
+        logger.logger.info("Visualization report generated successfully")
+    except Exception as e:
+        logger.log_error(e, "Visualization generation")
+        logger.logger.warning("Could not generate visualization report")
+
+    # --- Display Best Strategy ---
+    if all_results:
+        best_strategy = df.loc[df['final_price'].idxmax()]
+        best_strategy_name = best_strategy['airdrop_strategy_name']
+        print(f"\nBest Strategy (Highest Final Price): {best_strategy_name}")
+        print(f"  Final Price: ${best_strategy['final_price']:.4f}")
+        print(f"  Final Supply: {best_strategy['final_supply']:.2f}")
+        print(f"  Strategy Details: {best_strategy['strategy_details']}")
+
+        logger.logger.info(f"Best performing strategy: {best_strategy_name} with final price ${best_strategy['final_price']:.4f}")
+
+if __name__ == "__main__":
+    main()
@@ -3,41 +3,79 @@ Core simulation module for the airdrop simulation system.
 
 This module contains the core simulation logic that models token trading behavior:
 
+- _execute_trades(): Numba-compiled pass that executes a step's trades and aggregates demand,
+  supply and transaction volume without intermediate arrays
 - simulate_step(): Simulates a single step of the market, handling trades, price impact,
   token burning, user activity evolution, and whale detection
 - run_simulation(): Main simulation loop that orchestrates the entire simulation process
   over multiple steps, integrating data generation, probability calculations, and step-by-step
   market evolution
+- init_strategy_worker() / run_strategy(): Pool worker setup and per-strategy entry point shared
+  by the command line front ends, which simulate strategies in parallel processes
 
 The simulation includes realistic market mechanics such as gas fees, liquidity pools,
-price impact calculations, and dynamic user behavior adaptation.
+price impact calculations, and dynamic user behavior adaptation. Per-user arrays are float32;
+price, supply and other aggregates are kept as double-precision scalars.
 """
 
+import types
+
+import numba
 import numpy as np
-from typing import Tuple, Dict, Any, List
+from numba import njit
+from typing import Tuple, Dict, Any, List, Optional
 
 from config import SIMULATION_STEPS, INITIAL_PRICE, INITIAL_TOKENS
-from helpers import dynamic_vesting, calculate_buy_sell_probabilities
+from helpers import dynamic_vesting, vesting_schedule, calculate_buy_sell_probabilities, market_cycle_table
 from validation import validate_simulation_params, ValidationError
 
+# Per-user random draws are generated this many elements at a time (per array), so a run
+# amortizes RNG calls over many steps without holding steps x users draws in memory
+_RANDOM_BLOCK_ELEMENTS = 1 << 18
+
+# Price and sentiment histories are recorded every this many steps, starting at step 0
+_HISTORY_INTERVAL = 1024
+
 # --- Simulation Step ---
-def _calculate_trade_volumes(holdings: np.ndarray, buy_probability: np.ndarray, sell_probability: np.ndarray, price: float, total_supply: float) -> Tuple[np.ndarray, np.ndarray]:
-    """Calculates the buy and sell amounts based on probabilities and constraints."""
-    buy_decisions = np.random.uniform(size=holdings.shape) < buy_probability
-    sell_decisions = np.random.uniform(size=holdings.shape) < sell_probability
-    buy_amount = np.minimum(buy_decisions * (price * 50.0), total_supply * 0.005)
-    sell_amount = sell_decisions * holdings
-    return buy_amount, sell_amount
-
-def _apply_price_impact(demand: float, supply: float, price: float, initial_tokens: float) -> float:
-    """Applies price impact based on demand, supply, and liquidity."""
+@njit(cache=True)
+def _execute_trades(holdings: np.ndarray, buy_probability: np.ndarray, sell_probability: np.ndarray, buy_draws: np.ndarray, sell_draws: np.ndarray, user_activity: np.ndarray, price: float, total_supply: float, new_holdings: np.ndarray) -> Tuple[float, float, float, float]:
+    """
+    Executes one step of trades in a single pass over users, writing post-trade holdings into
+    new_holdings and returning the step's (demand, supply, transaction_volume, total_holdings).
+
+    Runs serially so the reductions are deterministic for seeded runs.
+    """
+    # Add gas fee impact
+    gas_fee = 0.001 * price  # Dynamic gas pricing
+    effective_buy_price = price + gas_fee
+    effective_sell_price = price - gas_fee
+    buy_size = min(price * 50.0, total_supply * 0.005)
+
+    demand = 0.0
+    supply = 0.0
+    transaction_volume = 0.0
+    total_holdings = 0.0
+    for i in range(holdings.shape[0]):
+        buy_amount = buy_size if buy_draws[i] < buy_probability[i] else 0.0
+        sell_amount = holdings[i] if sell_draws[i] < sell_probability[i] else 0.0
+
+        demand += buy_amount * effective_buy_price * user_activity[i]
+        supply += sell_amount * effective_sell_price * holdings[i] * user_activity[i]
+        transaction_volume += buy_amount + sell_amount
+        new_holdings[i] = holdings[i] + buy_amount - sell_amount
+        total_holdings += new_holdings[i]
+
+    return demand, supply, transaction_volume, total_holdings
+
+def _apply_price_impact(demand: float, supply: float, price: float, initial_tokens: float, price_noise: float) -> float:
+    """Applies price impact based on demand, supply, and liquidity, given a standard normal price_noise draw."""
     liquidity_pool = 0.05 * initial_tokens  # Constant product AMM-like
     price_impact = (demand - supply) / liquidity_pool
     new_price = price * np.exp(price_impact * 0.1)  # Exponential curve
-    new_price += np.random.normal(0, 0.005 * price)  # Volatility scaling
+    new_price += 0.005 * price * price_noise  # Volatility scaling
     return np.maximum(new_price, 0.000001)
 
-def simulate_step(step: int, holdings: np.ndarray, buy_probability: np.ndarray, sell_probability: np.ndarray, total_supply: float, price: float, airdrop_per_user: np.ndarray, user_activity: np.ndarray, user_params: np.ndarray, params: Dict[str, Any]) -> Dict[str, Any]:
+def simulate_step(step: int, holdings: np.ndarray, buy_probability: np.ndarray, sell_probability: np.ndarray, total_supply: float, price: float, airdrop_per_user: np.ndarray, user_activity: np.ndarray, user_params: np.ndarray, params: Dict[str, Any], vested_so_far: Optional[np.ndarray] = None, draws: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray, float]] = None, was_whale: Optional[np.ndarray] = None, out: Optional[Tuple[np.ndarray, np.ndarray]] = None, schedule: Optional[Tuple[int, int, int, float, float]] = None) -> Dict[str, Any]:
     """
     Simulates a single step of the airdrop process.
 
@@ -52,54 +90,80 @@ def simulate_step(step: int, holdings: np.ndarray, buy_probability: np.ndarray,
         user_activity (np.ndarray): An array of user activity levels.
         user_params (np.ndarray): An array of user parameters.
         params (Dict[str, Any]): Dictionary of simulation parameters including airdrop strategy.
+        vested_so_far (Optional[np.ndarray]): Amount vested to each user so far, updated in place.
+            Starts from zero if None.
+        draws (Optional[Tuple[np.ndarray, np.ndarray, np.ndarray, float]]): This step's random draws as
+            (buy uniforms, sell uniforms, activity standard normals, price standard normal), e.g.
+            pre-drawn by run_simulation(). Drawn from np.random if None.
+        was_whale (Optional[np.ndarray]): Boolean mask of users already treated as whales, updated in
+            place so whale modifiers apply once per user. If None, every current whale is modified.
+        out (Optional[Tuple[np.ndarray, np.ndarray]]): Preallocated (holdings, activity) arrays to write the
+            step's results into; they must not alias the holdings and user_activity inputs. New arrays
+            are allocated if None.
+        schedule (Optional[Tuple[int, int, int, float, float]]): The strategy's vesting_schedule(),
+            precomputed once per run. Derived from the strategy if None.
 
     Returns:
-        Dict[str, Any]: A dictionary containing the new holdings, new price, new total supply, and updated user activity.
+        Dict[str, Any]: A dictionary containing the new holdings and their total, new price, new total supply,
+            and updated user activity.
     """
     airdrop_strategy = params.get("airdrop_strategy", {"type": "none", "percentage": 0.1, "vesting": "none"})
     initial_price = params.get("initial_price", 0.10)
     initial_tokens = params.get("initial_tokens", 1_000_000_000)
 
-    if airdrop_strategy.get("vesting", "none") != "none":
-        holdings = dynamic_vesting(holdings, airdrop_per_user, price, airdrop_strategy, step, user_activity)
+    if schedule is None:
+        schedule = vesting_schedule(airdrop_strategy)
+    if vested_so_far is None:
+        vested_so_far = np.zeros_like(airdrop_per_user)
+    holdings = dynamic_vesting(holdings, airdrop_per_user, price, airdrop_strategy, step, user_activity, vested_so_far, schedule)
+
+    # Trades, holdings and demand/supply aggregates in one compiled pass. Aggregates stay in
+    # double precision; supply changes are tiny relative to its size
+    if draws is None:
+        draws = (
+            np.random.uniform(size=holdings.shape), np.random.uniform(size=holdings.shape),
+            np.random.standard_normal(size=user_activity.shape), np.random.standard_normal()
+        )
+    buy_draws, sell_draws, activity_noise, price_noise = draws
+    if out is None:
+        new_holdings, new_activity = np.empty_like(holdings), np.empty_like(user_activity)
+    else:
+        new_holdings, new_activity = out
+    demand, supply, transaction_volume, total_holdings = _execute_trades(holdings, buy_probability, sell_probability, buy_draws, sell_draws, user_activity, price, total_supply, new_holdings)
+
+    new_price = _apply_price_impact(demand, supply, price, initial_tokens, price_noise)
 
-    buy_amount, sell_amount = _calculate_trade_volumes(holdings, buy_probability, sell_probability, price, total_supply)
-
-    # Add gas fee impact
-    gas_fee = 0.001 * price  # Dynamic gas pricing
-    effective_buy_price = price + gas_fee
-    effective_sell_price = price - gas_fee
-
-    # Modify demand/supply calculations
-    demand = np.sum(buy_amount * effective_buy_price * user_activity)
-    supply = np.sum(sell_amount * effective_sell_price * holdings * user_activity)
-
-    new_price = _apply_price_impact(demand, supply, price, initial_tokens)
-
-    new_holdings = holdings + buy_amount - sell_amount
-
-    transaction_volume = np.sum(buy_amount + sell_amount)
     burn_rate = 0.05
     new_total_supply = total_supply - transaction_volume * burn_rate
 
-    # Add activity evolution based on market conditions
-    activity_change = np.where(
-        price > initial_price,
-        np.random.normal(0.5, 0.2, size=user_activity.shape),
-        np.random.normal(-0.3, 0.2, size=user_activity.shape)
-    )
-    user_activity = np.clip(user_activity * (1 + activity_change), 5, 200)
+    # Add activity evolution based on market conditions: N(0.5, 0.2) in a rising market,
+    # N(-0.3, 0.2) otherwise
+    activity_mean = 0.5 if price > initial_price else -0.3
+    np.multiply(activity_noise, 0.2, out=new_activity)
+    new_activity += 1 + activity_mean
+    new_activity *= user_activity
+    # In-place bounds avoid np.clip's dispatch overhead on these small per-step arrays
+    np.minimum(new_activity, 200, out=new_activity)
+    user_activity = np.maximum(new_activity, 5, out=new_activity)
 
     # Whale Detection System
     whale_threshold = 0.01 * initial_tokens
     whales = holdings > whale_threshold
-    if np.any(whales):
+    if was_whale is not None:
+        # Modifiers are multiplicative, so only apply them when a user first becomes a whale
+        # (for booleans, whales > was_whale is whales & ~was_whale, without the temporaries)
+        new_whales = np.greater(whales, was_whale, out=whales)
+        was_whale |= new_whales
+    else:
+        new_whales = whales
+    if np.any(new_whales):
         # Apply whale-specific behavior modifiers
-        user_params[whales, 1] *= 0.8  # Reduce sell probability
-        user_params[whales, 3] *= 1.2  # Increase market influence
+        user_params[new_whales, 1] *= 0.8  # Reduce sell probability
+        user_params[new_whales, 3] *= 1.2  # Increase market influence
 
     return {
         "holdings": new_holdings,
+        "total_holdings": total_holdings,
         "price": new_price,
         "total_supply": new_total_supply,
         "user_activity": user_activity
@@ -111,7 +175,8 @@ def run_simulation(params: Dict[str, Any]) -> Tuple[List[float], float, List[flo
     Runs the airdrop simulation.
 
     Args:
-        params (Dict[str, Any]): A dictionary containing simulation parameters including airdrop strategy.
+        params (Dict[str, Any]): A dictionary containing simulation parameters including airdrop strategy
+            and an optional 'seed' for the run's random generator.
 
     Returns:
         Tuple[List[float], float, List[float]]: A tuple containing the price history, final total supply, and market sentiment history.
@@ -132,28 +197,59 @@ def run_simulation(params: Dict[str, Any]) -> Tuple[List[float], float, List[flo
         market_sentiment = params.get('market_sentiment', 0.0)
         airdrop_strategy = params.get('airdrop_strategy', {"type": "none", "percentage": 0.1, "vesting": "none"})
 
-        user_params = assign_user_parameters(num_users)
-        airdrop_distribution, user_activity = generate_user_data(num_users, airdrop_strategy, user_params)
+        rng = np.random.Generator(np.random.SFC64(params.get('seed')))
+        user_params = assign_user_parameters(num_users, rng)
+        airdrop_distribution, user_activity = generate_user_data(num_users, airdrop_strategy, user_params, rng)
 
         holdings = np.copy(airdrop_distribution)
+        # Kept up to date by each step's trade pass instead of re-summing holdings
+        total_holdings = float(np.sum(holdings))
         total_supply = float(initial_tokens)
         price = float(initial_price)
 
         airdrop_per_user = np.copy(airdrop_distribution)
+        # Vesting progress is per-run state, kept out of the (shared) strategy config
+        vested_so_far = np.zeros_like(airdrop_per_user)
+        was_whale = np.zeros(num_users, dtype=bool)
+        schedule = vesting_schedule(airdrop_strategy)
+        # Probability buffers are rewritten every step rather than reallocated
+        probability_buffers = (np.empty(num_users, dtype=np.float32), np.empty(num_users, dtype=np.float32))
+        # Step results alternate between two sets of (holdings, activity) buffers, so a step never
+        # writes over its own inputs and nothing is allocated per step
+        step_buffers = [(np.empty_like(holdings), np.empty_like(user_activity)) for _ in range(2)]
+        cycle_table = market_cycle_table(simulation_steps)
+
+        # All randomness comes from the run's generator: scalar noise for the whole run up front,
+        # per-user draws in blocks of steps
+        price_noise = rng.standard_normal(simulation_steps)
+        sentiment_noise = rng.normal(0, 0.01, size=simulation_steps)
+        block_steps = min(simulation_steps, max(1, _RANDOM_BLOCK_ELEMENTS // max(1, num_users)))
+        # Blocks are refilled in place rather than reallocated
+        buy_block = np.empty((block_steps, num_users), dtype=np.float32)
+        sell_block = np.empty_like(buy_block)
+        activity_block = np.empty_like(buy_block)
 
         price_history: List[float] = []
         market_sentiment_history: List[float] = []
         initial_market_sentiment = float(market_sentiment)
 
         for step in range(simulation_steps):
-            buy_probability, sell_probability = calculate_buy_sell_probabilities(user_params, price, initial_price, initial_market_sentiment, airdrop_strategy, holdings, step)
-            step_results = simulate_step(step, holdings, buy_probability, sell_probability, total_supply, price, airdrop_per_user, user_activity, user_params, params)
+            row = step % block_steps
+            if row == 0:
+                block_rows = min(block_steps, simulation_steps - step)
+                buy_draws = rng.random(dtype=np.float32, out=buy_block[:block_rows])
+                sell_draws = rng.random(dtype=np.float32, out=sell_block[:block_rows])
+                activity_noise = rng.standard_normal(dtype=np.float32, out=activity_block[:block_rows])
+
+            buy_probability, sell_probability = calculate_buy_sell_probabilities(user_params, price, initial_price, initial_market_sentiment, airdrop_strategy, holdings, cycle_table[step], probability_buffers, total_holdings)
+            step_results = simulate_step(step, holdings, buy_probability, sell_probability, total_supply, price, airdrop_per_user, user_activity, user_params, params, vested_so_far, (buy_draws[row], sell_draws[row], activity_noise[row], price_noise[step]), was_whale, step_buffers[step % 2], schedule)
             holdings = step_results["holdings"]
+            total_holdings = step_results["total_holdings"]
             price = step_results["price"]
             total_supply = step_results["total_supply"]
             user_activity = step_results["user_activity"]
 
-            if step % 1024 == 0:
+            if step % _HISTORY_INTERVAL == 0:
                 price_history.append(price)
                 market_sentiment_history.append(initial_market_sentiment)
 
@@ -164,13 +260,49 @@ def run_simulation(params: Dict[str, Any]) -> Tuple[List[float], float, List[flo
             sentiment_change = (
                 0.4 * price_change +
                 0.2 * -supply_change +
-                np.random.normal(0, 0.01)
+                sentiment_noise[step]
             )
             new_market_sentiment = initial_market_sentiment + sentiment_change
-            new_market_sentiment = np.clip(new_market_sentiment, -0.5, 0.5)
+            # Scalar bounds; np.clip's array dispatch costs more than the rest of this block
+            new_market_sentiment = min(0.5, max(-0.5, float(new_market_sentiment)))
             initial_market_sentiment = new_market_sentiment
 
         return price_history, total_supply, market_sentiment_history
 
     except Exception as e:
-        raise ValidationError(f"Error in run_simulation: {str(e)}")
\ No newline at end of file
+        raise ValidationError(f"Error in run_simulation: {str(e)}")
+
+def init_strategy_worker() -> None:
+    """Prepare a pool worker: single-threaded Numba kernels."""
+    # Parallelism comes from the pool; avoid oversubscribing cores with kernel threads
+    numba.set_num_threads(1)
+
+def run_strategy(airdrop_strategy: Dict[str, Any], base_params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Runs a single strategy simulation, e.g. in a pool worker.
+
+    Args:
+        airdrop_strategy (Dict[str, Any]): The strategy to simulate, including its 'name'.
+        base_params (Dict[str, Any]): Simulation parameters shared by every strategy.
+
+    Returns:
+        Dict[str, Any]: The strategy's result row, or its name and an 'error' message if the run failed.
+    """
+    try:
+        # Read-only view: simulation state must not be written back into the strategy config
+        params = dict(base_params, airdrop_strategy=types.MappingProxyType(airdrop_strategy))
+        price_history, final_supply, market_sentiment_history = run_simulation(params)
+
+        return {
+            "airdrop_strategy_name": airdrop_strategy["name"],
+            "final_price": price_history[-1],  # Step 0 is always recorded
+            "price_history": price_history,
+            "final_supply": final_supply,
+            "market_sentiment_history": market_sentiment_history,
+            # Full strategy definitions stay with the caller; keep only what the report plots
+            "strategy_type": airdrop_strategy["type"],
+            "vesting_type": airdrop_strategy["vesting"],
+            "percentage": airdrop_strategy["percentage"]
+        }
+    except Exception as e:
+        return {"airdrop_strategy_name": airdrop_strategy["name"], "error": f"{type(e).__name__}: {e}"}
@@ -5,8 +5,8 @@ This module handles the creation and management of different airdrop strategies:
 
 - AIRDROP_PARAMETER_GRID: Comprehensive parameter grid defining all possible strategy combinations
   including distribution types (lottery, uniform, tiered), vesting mechanisms, criteria, thresholds, and weights
-- generate_airdrop_strategies(): Main function that creates strategy combinations from the parameter grid,
-  handles special cases for tiered strategies, validates parameter combinations, and assigns unique names
+- generate_airdrop_strategies(): Main function that samples strategy combinations from the parameter grid,
+  combining only the parameters each distribution type and vesting mechanism uses, and assigns unique names
 
 The module supports complex strategy generation with proper validation to ensure only valid
 strategy combinations are created for simulation.
@@ -34,10 +34,54 @@ AIRDROP_PARAMETER_GRID: Dict[str, Any] = {
 }
 
 # --- Function to Generate Airdrop Strategies ---
+# Extra parameter used by each dynamic vesting type
+_VESTING_THRESHOLD_KEYS: Dict[str, str] = {
+    "dynamic_price": "price_threshold",
+    "dynamic_activity": "activity_threshold",
+}
+
+def _distribution_options(param_grid: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Expands the distribution part of the grid, keeping only the keys each type uses."""
+    options = []
+    for airdrop_type in param_grid["type"]:
+        if airdrop_type == "lottery":
+            options.extend({"type": "lottery", "winners_fraction": fraction} for fraction in param_grid["winners_fraction"])
+        elif airdrop_type == "tiered":
+            for criteria in param_grid["criteria"]:
+                if criteria == "none":
+                    continue
+                for thresholds, weights in itertools.product(param_grid["thresholds"][criteria], param_grid["weights"]):
+                    options.append({"type": "tiered", "criteria": criteria, "thresholds": thresholds, "weights": weights})
+        else:
+            options.append({"type": airdrop_type})
+    return options
+
+def _vesting_options(param_grid: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Expands the vesting part of the grid, keeping only the keys each vesting type uses."""
+    options = []
+    for vesting in param_grid["vesting"]:
+        if vesting == "none":
+            options.append({"vesting": "none"})
+            continue
+        threshold_key = _VESTING_THRESHOLD_KEYS.get(vesting)
+        for vesting_periods in param_grid["vesting_periods"]:
+            if threshold_key is None:
+                options.append({"vesting": vesting, "vesting_periods": vesting_periods})
+            else:
+                options.extend(
+                    {"vesting": vesting, "vesting_periods": vesting_periods, threshold_key: threshold}
+                    for threshold in param_grid[threshold_key]
+                )
+    return options
+
 def generate_airdrop_strategies(param_grid: Dict[str, Any], max_strategies: int) -> List[Dict[str, Any]]:
     """
     Generates a list of airdrop strategies based on the given parameter grid.
 
+    Only parameters relevant to a strategy's type and vesting are combined, so no generated
+    strategy is a duplicate differing only in unused keys. Strategies are sampled without
+    building the full set of combinations.
+
     Args:
         param_grid (Dict[str, Any]): A dictionary defining the parameter grid for the airdrop strategies.
         max_strategies (int): The maximum number of strategies to generate.
@@ -45,64 +89,21 @@ def generate_airdrop_strategies(param_grid: Dict[str, Any], max_strategies: int)
     Returns:
         List[Dict[str, Any]]: A list of airdrop strategies.
     """
-    keys = list(param_grid.keys())
-    strategies = []
-
-    tiered_combinations = []
-    non_tiered_keys = [k for k in keys if k not in ("thresholds", "weights")]
-
-    if "type" in param_grid and "tiered" in param_grid["type"]:
-        tiered_indices = [i for i, val in enumerate(param_grid["type"]) if val == "tiered"]
-
-        for type_index in tiered_indices:
-            temp_grid = {k: param_grid[k] for k in non_tiered_keys}
-            temp_grid["type"] = ["tiered"]
-            temp_grid["criteria"] = [c for c in param_grid["criteria"] if c != "none"]
-
-            for combo in itertools.product(*[temp_grid[k] for k in temp_grid]):
-                strategy = dict(zip(temp_grid.keys(), combo))
-                criteria_value = strategy["criteria"]
-                threshold_options = param_grid["thresholds"][criteria_value]
-                weight_options = param_grid["weights"]
-
-                for threshold, weight in itertools.product(threshold_options, weight_options):
-                    new_strategy = strategy.copy()
-                    new_strategy["thresholds"] = threshold
-                    new_strategy["weights"] = weight
-                    new_strategy["criteria"] = criteria_value
-                    tiered_combinations.append(new_strategy)
-
-    other_combinations = []
-    non_tiered_keys = [k for k in keys if k not in ("thresholds", "weights")]
-    temp_grid = {k: param_grid[k] for k in non_tiered_keys}
-
-    for combo in itertools.product(*[temp_grid[k] for k in non_tiered_keys]):
-        strategy = dict(zip(non_tiered_keys, combo))
-        if strategy["type"] != "tiered":
-            strategy.pop("criteria", None)
-            other_combinations.append(strategy)
-
-    all_combinations = tiered_combinations + other_combinations
-    random.shuffle(all_combinations)
-
-    for strategy in all_combinations:
-        if len(strategies) >= max_strategies:
-            break
-
-        # Validate parameter combinations
-        if strategy['type'] == 'lottery' and 'winners_fraction' not in strategy:
-            continue
-        if strategy['vesting'] == 'dynamic_price' and 'price_threshold' not in strategy:
-            continue
-        if strategy['vesting'] == 'dynamic_activity' and 'activity_threshold' not in strategy:
-            continue
-        if strategy['vesting'] != 'none' and 'vesting_periods' not in strategy:
-            continue
-
+    distributions = _distribution_options(param_grid)
+    percentages = param_grid["percentage"]
+    vestings = _vesting_options(param_grid)
 
+    # Sample flat indices into the (distribution, percentage, vesting) product and decode only those
+    num_combinations = len(distributions) * len(percentages) * len(vestings)
+    strategies = []
+    for index in random.sample(range(num_combinations), min(max_strategies, num_combinations)):
+        index, vesting_index = divmod(index, len(vestings))
+        distribution_index, percentage_index = divmod(index, len(percentages))
+        strategy = dict(distributions[distribution_index], percentage=percentages[percentage_index])
+        strategy.update(vestings[vesting_index])
         strategies.append(strategy)
 
     for i, strategy in enumerate(strategies):
         strategy["name"] = f"Strategy_{i+1}"
 
-    return strategies
\ No newline at end of file
+    return strategies
@@ -6,6 +6,11 @@ This module contains unit tests for the data generation functionality, specifica
 - test_generate_user_data_uniform(): Tests uniform airdrop distribution where all users
   receive equal token amounts based on the airdrop percentage
 - test_generate_user_data_none(): Tests the case where no airdrop distribution occurs
+- test_generate_user_data_tiered(): Tests tiered distribution by activity, where only
+  users meeting at least one threshold receive tokens
+- test_generate_user_data_seeded(): Tests that equally seeded generators produce identical data
+- test_generate_user_data_lottery(): Tests that lottery winners are distinct and share the
+  airdrop equally, for both small and large winner fractions
 
 These tests ensure that the generate_user_data() function correctly handles different
 airdrop strategies and produces expected token distributions.
@@ -16,23 +21,61 @@ import numpy as np
 from config import INITIAL_TOKENS
 from data_generation import generate_user_data
 
-def test_generate_user_data_uniform():
+@pytest.fixture(scope="module")
+def user_params():
+    # Dummy user parameters (shape: num_users x 4), shared read-only; tests slice off the rows they need
+    user_params = np.ones((1000, 4))
+    user_params.flags.writeable = False
+    return user_params
+
+def test_generate_user_data_uniform(user_params):
     num_users = 100
     airdrop_strategy = {"type": "uniform", "percentage": 0.1}
-    # Dummy user parameters (shape: num_users x 4)
-    user_params = np.ones((num_users, 4))
-    distribution, activity = generate_user_data(num_users, airdrop_strategy, user_params)
+    distribution, activity = generate_user_data(num_users, airdrop_strategy, user_params[:num_users])
     
     assert distribution.shape[0] == num_users
     assert activity.shape[0] == num_users
+    assert distribution.dtype == np.float32 and activity.dtype == np.float32
     # For a uniform strategy, all users are eligible so distribution > 0
     assert np.allclose(np.sum(distribution), INITIAL_TOKENS * 0.1)
 
-def test_generate_user_data_none():
+def test_generate_user_data_none(user_params):
     num_users = 50
     airdrop_strategy = {"type": "none", "percentage": 0.1}
-    user_params = np.ones((num_users, 4))
-    distribution, activity = generate_user_data(num_users, airdrop_strategy, user_params)
+    distribution, activity = generate_user_data(num_users, airdrop_strategy, user_params[:num_users])
     
     # When type is "none", no one should get tokens
     assert np.allclose(distribution, 0.0)
+
+def test_generate_user_data_tiered(user_params):
+    num_users = 200
+    airdrop_strategy = {
+        "type": "tiered", "percentage": 0.1, "criteria": "activity",
+        "thresholds": [30, 10, 50, 100], "weights": [0.2, 0.1, 0.3, 0.4]
+    }
+    distribution, activity = generate_user_data(num_users, airdrop_strategy, user_params[:num_users])
+
+    # Users below the lowest threshold get nothing; the rest share the airdrop
+    assert np.allclose(distribution[activity < 10], 0.0)
+    assert np.all(distribution[activity >= 10] > 0)
+    assert np.isclose(np.sum(distribution), INITIAL_TOKENS * 0.1)
+
+def test_generate_user_data_seeded(user_params):
+    num_users = 100
+    airdrop_strategy = {"type": "lottery", "percentage": 0.1, "winners_fraction": 0.1}
+    first = generate_user_data(num_users, airdrop_strategy, user_params[:num_users], np.random.Generator(np.random.SFC64(42)))
+    second = generate_user_data(num_users, airdrop_strategy, user_params[:num_users], np.random.Generator(np.random.SFC64(42)))
+
+    assert np.array_equal(first[0], second[0])
+    assert np.array_equal(first[1], second[1])
+
+@pytest.mark.parametrize("winners_fraction", [0.05, 0.5])
+def test_generate_user_data_lottery(winners_fraction, user_params):
+    num_users = 1000
+    airdrop_strategy = {"type": "lottery", "percentage": 0.1, "winners_fraction": winners_fraction}
+    distribution, _ = generate_user_data(num_users, airdrop_strategy, user_params[:num_users], np.random.default_rng(7))
+
+    winners = distribution > 0
+    assert np.sum(winners) == int(num_users * winners_fraction)
+    assert np.allclose(distribution[winners], distribution[winners][0])
+    assert np.isclose(np.sum(distribution), INITIAL_TOKENS * 0.1)
@@ -7,6 +7,8 @@ This module contains unit tests for the core helper functions:
   ensuring that buy and sell probabilities are properly bounded between 0 and 1
 - test_dynamic_vesting_linear(): Tests the linear vesting mechanism to ensure
   tokens are properly vested at the correct intervals
+- test_market_cycle_table(): Tests that the precomputed market cycle matches the
+  per-step sine schedule
 
 These tests validate the mathematical correctness and boundary conditions of
 the helper functions used throughout the simulation.
@@ -14,28 +16,42 @@ the helper functions used throughout the simulation.
 
 import pytest
 import numpy as np
-from helpers import calculate_buy_sell_probabilities, dynamic_vesting
-from config import INITIAL_PRICE
+from helpers import calculate_buy_sell_probabilities, dynamic_vesting, market_cycle_table
+from config import INITIAL_PRICE, MARKET_CYCLES
 
-def test_calculate_buy_sell_probabilities():
-    num_users = 10
-    # Create dummy parameters: all ones for simplicity.
-    user_params = np.ones((num_users, 4))
+@pytest.fixture(scope="module")
+def user_params():
+    # Create dummy parameters: all ones for simplicity. Shared, so read-only
+    user_params = np.ones((10, 4))
+    user_params.flags.writeable = False
+    return user_params
+
+def test_calculate_buy_sell_probabilities(user_params):
+    num_users = user_params.shape[0]
     current_price = INITIAL_PRICE * 1.2
     initial_price = INITIAL_PRICE
     market_sentiment = 0.0
     airdrop_strategy = {"type": "uniform", "airdrop_price": initial_price}
     holdings = np.ones(num_users)
-    step = 0
+    cycle = 0.0
 
     buy_prob, sell_prob = calculate_buy_sell_probabilities(
         user_params, current_price, initial_price, market_sentiment,
-        airdrop_strategy, holdings, step
+        airdrop_strategy, holdings, cycle
     )
     # Probabilities must be between 0 and 1.
     assert np.all(buy_prob >= 0.0) and np.all(buy_prob <= 1.0)
     assert np.all(sell_prob >= 0.0) and np.all(sell_prob <= 1.0)
 
+    # Preallocated buffers are filled in place with the same values
+    buffers = (np.empty(num_users), np.empty(num_users))
+    buffered = calculate_buy_sell_probabilities(
+        user_params, current_price, initial_price, market_sentiment,
+        airdrop_strategy, holdings, cycle, out=buffers
+    )
+    assert buffered[0] is buffers[0] and buffered[1] is buffers[1]
+    assert np.allclose(buffered[0], buy_prob) and np.allclose(buffered[1], sell_prob)
+
 def test_dynamic_vesting_linear():
     num_users = 10
     holdings = np.zeros(num_users)
@@ -44,7 +60,23 @@ def test_dynamic_vesting_linear():
     airdrop_strategy = {"vesting": "linear", "vesting_periods": 2}
     step = 0
     user_activity = np.ones(num_users) * 50
+    vested_so_far = np.zeros(num_users)
 
-    new_holdings = dynamic_vesting(holdings, airdrop_per_user, current_price, airdrop_strategy, step, user_activity)
+    new_holdings = dynamic_vesting(holdings, airdrop_per_user, current_price, airdrop_strategy, step, user_activity, vested_so_far)
     # In linear vesting, if step is at the vesting interval (step 0 qualifies), holdings should increase.
     assert np.all(new_holdings >= holdings)
+    # Vesting progress is tracked in the caller's state, not in the strategy
+    assert np.allclose(vested_so_far, new_holdings - holdings)
+    assert 'vested_so_far' not in airdrop_strategy
+
+def test_market_cycle_table():
+    simulation_steps = 100
+    cycle_table = market_cycle_table(simulation_steps)
+
+    assert cycle_table.shape == (simulation_steps,)
+    assert np.all(np.abs(cycle_table) <= MARKET_CYCLES['amplitude'])
+    step = 37
+    assert np.isclose(cycle_table[step], np.sin(step * MARKET_CYCLES['frequency']) * MARKET_CYCLES['amplitude'])
+    # Shared between simulations, so it must come back as the same read-only array
+    assert market_cycle_table(simulation_steps) is cycle_table
+    assert not cycle_table.flags.writeable
@@ -5,8 +5,12 @@ This module contains unit tests for the core simulation functionality:
 
 - test_simulate_step(): Tests a single simulation step to ensure proper handling
   of trades, price impact, token burning, and whale detection
+- test_simulate_step_whale_modifiers_apply_once(): Tests that whale modifiers are applied only
+  when a user first becomes a whale
 - test_run_simulation(): Tests the complete simulation run to verify that
   price history is recorded correctly and token supply decreases over time
+- test_run_simulation_with_vesting(): Tests a complete run of a vesting strategy
+- test_run_simulation_seeded(): Tests that runs with the same seed reproduce the same results
 
 These tests validate the core simulation mechanics and ensure that market
 dynamics behave as expected under different conditions.
@@ -46,6 +50,24 @@ def test_simulate_step():
     # Expect that some tokens are burned so total_supply should be lower.
     assert step_results["total_supply"] < total_supply
 
+def test_simulate_step_whale_modifiers_apply_once():
+    num_users = 4
+    holdings = np.array([0.0, 0.0, INITIAL_TOKENS * 0.02, 0.0])
+    user_params = np.full((num_users, 4), 0.5)
+    was_whale = np.zeros(num_users, dtype=bool)
+    params = {"initial_price": INITIAL_PRICE, "initial_tokens": INITIAL_TOKENS}
+
+    for step in range(3):
+        simulate_step(
+            step, holdings, np.zeros(num_users), np.zeros(num_users), INITIAL_TOKENS, INITIAL_PRICE,
+            np.zeros(num_users), np.ones(num_users) * 20, user_params, params, was_whale=was_whale
+        )
+
+    assert np.array_equal(was_whale, [False, False, True, False])
+    assert np.isclose(user_params[2, 1], 0.5 * 0.8)
+    assert np.isclose(user_params[2, 3], 0.5 * 1.2)
+    assert np.all(user_params[[0, 1, 3]] == 0.5)
+
 def test_run_simulation():
     airdrop_strategy = {"type": "uniform", "percentage": 0.1, "vesting": "none"}
     num_users = 10
@@ -67,3 +89,31 @@ def test_run_simulation():
     expected_length = simulation_steps // 1024 + 1
     assert len(price_history) == expected_length
     assert final_supply < initial_tokens
+
+def test_run_simulation_with_vesting():
+    airdrop_strategy = {"type": "uniform", "percentage": 0.1, "vesting": "linear", "vesting_periods": 12}
+    params = {
+        "num_users": 100,
+        "simulation_steps": 100,
+        "initial_tokens": INITIAL_TOKENS,
+        "initial_price": INITIAL_PRICE,
+        "market_sentiment": 0.0,
+        "airdrop_strategy": airdrop_strategy
+    }
+
+    price_history, final_supply, market_sentiment_history = run_simulation(params)
+    assert len(price_history) == len(market_sentiment_history) == 1
+    assert final_supply < INITIAL_TOKENS
+
+def test_run_simulation_seeded():
+    params = {
+        "num_users": 100,
+        "simulation_steps": 2048,
+        "initial_tokens": INITIAL_TOKENS,
+        "initial_price": INITIAL_PRICE,
+        "market_sentiment": 0.0,
+        "airdrop_strategy": {"type": "uniform", "percentage": 0.1, "vesting": "none"},
+        "seed": 42
+    }
+
+    assert run_simulation(params) == run_simulation(params)
@@ -0,0 +1,36 @@
+"""
+Test suite for the strategy generation module.
+
+This module contains unit tests for airdrop strategy generation:
+
+- test_generate_airdrop_strategies_valid(): Tests that every generated strategy passes
+  validation, carries only the keys its type and vesting use, and has a unique name
+- test_generate_airdrop_strategies_exhaustive(): Tests that asking for more strategies than
+  the grid holds returns each distinct combination exactly once
+
+These tests ensure that generate_airdrop_strategies() samples well-formed, non-duplicated
+strategies from the parameter grid.
+"""
+
+import pytest
+from strategies import AIRDROP_PARAMETER_GRID, generate_airdrop_strategies
+from validation import validate_airdrop_strategy
+
+def test_generate_airdrop_strategies_valid():
+    strategies = generate_airdrop_strategies(AIRDROP_PARAMETER_GRID, 50)
+
+    assert len(strategies) == 50
+    assert len({strategy["name"] for strategy in strategies}) == 50
+    for strategy in strategies:
+        validate_airdrop_strategy(strategy)
+        assert ("winners_fraction" in strategy) == (strategy["type"] == "lottery")
+        assert ("criteria" in strategy) == (strategy["type"] == "tiered")
+        assert ("vesting_periods" in strategy) == (strategy["vesting"] != "none")
+        assert ("price_threshold" in strategy) == (strategy["vesting"] == "dynamic_price")
+        assert ("activity_threshold" in strategy) == (strategy["vesting"] == "dynamic_activity")
+
+def test_generate_airdrop_strategies_exhaustive():
+    strategies = generate_airdrop_strategies(AIRDROP_PARAMETER_GRID, 10**6)
+    combinations = {repr(sorted((k, v) for k, v in strategy.items() if k != "name")) for strategy in strategies}
+
+    assert len(combinations) == len(strategies)
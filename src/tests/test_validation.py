@@ -0,0 +1,56 @@
+"""
+Test suite for the validation module.
+
+This module contains unit tests for the validation helpers:
+
+- test_safe_divide(): Tests that division by zero and non-finite results fall back to the
+  default, for arrays, broadcast scalars and 0-d inputs
+- test_safe_log(): Tests that non-positive and non-finite inputs map to the default
+- test_validate_user_params(): Tests that out-of-range and NaN user parameters are rejected
+- test_import_then_fork_pool_exits(): Tests that a process which imports the module and then
+  runs a multiprocessing pool still exits, i.e. importing starts no Numba worker threads
+
+These tests ensure the numerical safety helpers never leak NaN or infinity.
+"""
+
+import os
+import subprocess
+import sys
+import pytest
+import numpy as np
+from validation import ValidationError, safe_divide, safe_log, validate_user_params
+
+def test_safe_divide():
+    numerator = np.array([1.0, 2.0, 0.0, np.inf, 3.0])
+    denominator = np.array([2.0, 0.0, 0.0, 1.0, np.nan])
+
+    assert np.array_equal(safe_divide(numerator, denominator, default=-1.0), [0.5, -1.0, -1.0, -1.0, -1.0])
+    assert np.array_equal(safe_divide(np.arange(4.0).reshape(2, 2), 2.0), [[0.0, 0.5], [1.0, 1.5]])
+    assert safe_divide(1.0, 0.0) == 0.0
+
+def test_safe_log():
+    result = safe_log(np.array([np.e, 1.0, 0.0, -2.0, np.inf, np.nan]), default=-1.0)
+
+    assert np.allclose(result, [1.0, 0.0, -1.0, -1.0, -1.0, -1.0])
+    assert safe_log(np.array([4, 0])).dtype == np.float64
+
+def test_validate_user_params():
+    validate_user_params(np.full((5, 4), 0.5))
+
+    for bad_value in (-0.1, 1.1, np.nan, np.inf):
+        user_params = np.full((5, 4), 0.5)
+        user_params[2, 1] = bad_value
+        with pytest.raises(ValidationError):
+            validate_user_params(user_params)
+
+def test_import_then_fork_pool_exits():
+    script = (
+        "import multiprocessing, validation\n"
+        "if __name__ == '__main__':\n"
+        "    with multiprocessing.Pool(2) as pool:\n"
+        "        assert pool.map(abs, [-1]) == [1]\n"
+    )
+    src_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    completed = subprocess.run([sys.executable, "-c", script], cwd=src_dir, timeout=120)
+
+    assert completed.returncode == 0
@@ -3,6 +3,7 @@ Validation module for airdrop simulation parameters.
 """
 from typing import Dict, Any, List
 import numpy as np
+from numba import float32, float64, vectorize
 
 
 class ValidationError(Exception):
@@ -10,6 +11,13 @@ class ValidationError(Exception):
     pass
 
 
+# Allowed strategy keys and values, checked with set operations on every validated strategy
+_REQUIRED_STRATEGY = frozenset(('type', 'percentage', 'vesting'))
+_VALID_TYPES = frozenset(('none', 'uniform', 'tiered', 'lottery', 'basic'))
+_VALID_VESTING = frozenset(('none', 'linear', 'dynamic_price', 'dynamic_activity'))
+_VALID_CRITERIA = frozenset(('holdings', 'activity'))
+
+
 def validate_airdrop_strategy(strategy: Dict[str, Any]) -> None:
     """
     Validates an airdrop strategy configuration.
@@ -20,24 +28,21 @@ def validate_airdrop_strategy(strategy: Dict[str, Any]) -> None:
     Raises:
         ValidationError: If the strategy is invalid.
     """
-    required_fields = ['type', 'percentage', 'vesting']
-    for field in required_fields:
-        if field not in strategy:
-            raise ValidationError(f"Missing required field: {field}")
+    missing = _REQUIRED_STRATEGY.difference(strategy)
+    if missing:
+        raise ValidationError(f"Missing required fields: {sorted(missing)}")
 
     # Validate strategy type
-    valid_types = ['none', 'uniform', 'tiered', 'lottery', 'basic']
-    if strategy['type'] not in valid_types:
-        raise ValidationError(f"Invalid strategy type: {strategy['type']}. Must be one of {valid_types}")
+    if strategy['type'] not in _VALID_TYPES:
+        raise ValidationError(f"Invalid strategy type: {strategy['type']}. Must be one of {sorted(_VALID_TYPES)}")
 
     # Validate percentage
     if not (0 <= strategy['percentage'] <= 1):
         raise ValidationError(f"Percentage must be between 0 and 1, got {strategy['percentage']}")
 
     # Validate vesting type
-    valid_vesting_types = ['none', 'linear', 'dynamic_price', 'dynamic_activity']
-    if strategy['vesting'] not in valid_vesting_types:
-        raise ValidationError(f"Invalid vesting type: {strategy['vesting']}. Must be one of {valid_vesting_types}")
+    if strategy['vesting'] not in _VALID_VESTING:
+        raise ValidationError(f"Invalid vesting type: {strategy['vesting']}. Must be one of {sorted(_VALID_VESTING)}")
 
     # Type-specific validation
     if strategy['type'] == 'lottery':
@@ -45,16 +50,15 @@ def validate_airdrop_strategy(strategy: Dict[str, Any]) -> None:
             raise ValidationError("Lottery strategy must have 'winners_fraction' between 0 and 1")
 
     if strategy['type'] == 'tiered':
-        if 'criteria' not in strategy or strategy['criteria'] not in ['holdings', 'activity']:
+        if 'criteria' not in strategy or strategy['criteria'] not in _VALID_CRITERIA:
             raise ValidationError("Tiered strategy must have valid 'criteria' (holdings or activity)")
         if 'thresholds' not in strategy or 'weights' not in strategy:
             raise ValidationError("Tiered strategy must have 'thresholds' and 'weights'")
 
-        thresholds = np.array(strategy['thresholds'])
-        weights = np.array(strategy['weights'])
-        if len(thresholds) != len(weights):
+        # Plain sequence checks; these lists are a handful of tiers, not worth converting to arrays
+        if len(strategy['thresholds']) != len(strategy['weights']):
             raise ValidationError("Thresholds and weights must have the same length")
-        if not np.all(weights >= 0):
+        if any(weight < 0 for weight in strategy['weights']):
             raise ValidationError("All weights must be non-negative")
 
     # Vesting-specific validation
@@ -121,10 +125,22 @@ def validate_user_params(user_params: np.ndarray) -> None:
     if user_params.shape[1] != 4:
         raise ValidationError("User parameters must have 4 columns (base_buy_prob, base_sell_prob, price_sensitivity, market_influence)")
 
-    if np.any(user_params < 0) or np.any(user_params > 1):
+    # Two scalar reductions instead of full-size boolean temporaries. min() and max() propagate NaN,
+    # and NaN fails both comparisons, so this also rejects non-finite values without an isfinite pass
+    if user_params.size and not (user_params.min() >= 0 and user_params.max() <= 1):
         raise ValidationError("All user parameters must be between 0 and 1")
 
 
+# A broadcasting ufunc, so no operand is expanded to the full shape. Single-threaded: nothing on
+# the simulation path calls it, and a parallel target would start Numba's threading layer at import
+# No fastmath here: it would let LLVM assume finite values and drop the isfinite checks
+@vectorize([float32(float32, float32, float32), float64(float64, float64, float64)], cache=True)
+def _safe_divide_ufunc(numerator: float, denominator: float, default: float) -> float:
+    """numerator / denominator, or default where the denominator is zero or the result non-finite."""
+    value = numerator / denominator if denominator != 0 else default
+    return value if np.isfinite(value) else default
+
+
 def safe_divide(numerator: np.ndarray, denominator: np.ndarray, default: float = 0.0) -> np.ndarray:
     """
     Safely divides two arrays, handling division by zero.
@@ -135,12 +151,13 @@ def safe_divide(numerator: np.ndarray, denominator: np.ndarray, default: float =
         default (float): Default value for division by zero.
 
     Returns:
-        np.ndarray: The result of the division.
+        np.ndarray: The result of the division, with default wherever it is undefined or non-finite.
     """
+    numerator, denominator = np.asarray(numerator), np.asarray(denominator)
+    dtype = np.result_type(numerator, denominator, 1.0)
+    # The compiled select may evaluate the division for masked-out lanes too; those flags are expected
     with np.errstate(divide='ignore', invalid='ignore'):
-        result = np.divide(numerator, denominator, out=np.full_like(numerator, default), where=(denominator != 0))
-        result = np.nan_to_num(result, nan=default, posinf=default, neginf=default)
-    return result
+        return _safe_divide_ufunc(numerator, denominator, dtype.type(default), dtype=dtype)
 
 
 def safe_log(array: np.ndarray, default: float = 0.0) -> np.ndarray:
@@ -152,9 +169,12 @@ def safe_log(array: np.ndarray, default: float = 0.0) -> np.ndarray:
         default (float): Default value for non-positive inputs.
 
     Returns:
-        np.ndarray: The logarithm of the array.
+        np.ndarray: The logarithm of the array, with default for non-positive or non-finite inputs.
     """
-    with np.errstate(divide='ignore', invalid='ignore'):
-        result = np.log(np.where(array > 0, array, np.inf))
-        result = np.nan_to_num(result, nan=default, posinf=default, neginf=default)
-    return result
\ No newline at end of file
+    array = np.asarray(array)
+    valid = np.isfinite(array)
+    valid &= array > 0
+    # log only runs on valid entries; the rest keep the default they were filled with
+    result = np.full(array.shape, default, dtype=np.result_type(array, 1.0))
+    np.log(array, out=result, where=valid)
+    return result
@@ -1,7 +1,11 @@
 """
 Visualization module for airdrop simulation results.
 """
+import functools
+import re
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+from matplotlib.lines import Line2D
 import seaborn as sns
 import pandas as pd
 import numpy as np
@@ -18,6 +22,34 @@ warnings.filterwarnings('ignore')
 plt.style.use('seaborn-v0_8')
 sns.set_palette("husl")
 
+# Resolution of saved report plots; figures lay themselves out (constrained_layout) at creation
+REPORT_DPI = 150
+
+# Type, vesting and percentage from a strategy_details string in one scan; each field is an
+# optional lookahead so key order does not matter and a missing key only leaves its column empty
+_STRATEGY_FIELDS_PATTERN = re.compile(
+    r"^(?=(?:.*?'type':\s*'(?P<strategy_type>[^']*)')?)"
+    r"(?=(?:.*?'vesting':\s*'(?P<vesting_type>[^']*)')?)"
+    r"(?=(?:.*?'percentage':\s*(?P<percentage>[\d.]+))?)",
+    re.DOTALL,
+)
+
+
+def _ensure_np(results: List[Dict[str, Any]]) -> None:
+    """Converts list price histories in results to float32 arrays in place, so later plots reuse them."""
+    for result in results:
+        price_history = result.get('price_history')
+        if isinstance(price_history, list):
+            result['price_history'] = np.asarray(price_history, dtype=np.float32)
+
+
+@functools.lru_cache(maxsize=32)
+def _viridis(n: int) -> np.ndarray:
+    """Returns n evenly spaced viridis RGBA colors, computed once per n and shared read-only."""
+    colors = plt.cm.viridis(np.linspace(0, 1, n))
+    colors.flags.writeable = False
+    return colors
+
 
 class SimulationVisualizer:
     """Handles visualization of simulation results."""
@@ -32,6 +64,31 @@ class SimulationVisualizer:
         self.save_dir = save_dir
         import os
         os.makedirs(save_dir, exist_ok=True)
+        # Results DataFrames by id() of the results list, holding the list so the id is not reused
+        self._df_cache: Dict[int, Tuple[List[Dict[str, Any]], pd.DataFrame]] = {}
+
+    def _df(self, results: List[Dict[str, Any]]) -> pd.DataFrame:
+        """
+        Returns the results as a DataFrame, built once per results list and shared by every plot.
+
+        The per-step histories are dropped, as plots that need them read them from results, and
+        final prices are stored as float32. Callers must not modify the returned DataFrame in place.
+
+        Args:
+            results (List[Dict[str, Any]]): Simulation results.
+
+        Returns:
+            pd.DataFrame: One row per result, without the history columns.
+        """
+        cached = self._df_cache.get(id(results))
+        if cached is None or cached[0] is not results:
+            df = pd.DataFrame(results).drop(columns=['price_history', 'market_sentiment_history'], errors='ignore')
+            # Supply stays float64: at a billion tokens float32 would already be off by whole tokens
+            if 'final_price' in df.columns:
+                df['final_price'] = df['final_price'].astype(np.float32)
+            cached = (results, df)
+            self._df_cache[id(results)] = cached
+        return cached[1]
 
     def plot_price_history(self, results: List[Dict[str, Any]], save_path: Optional[str] = None) -> plt.Figure:
         """
@@ -44,23 +101,32 @@ class SimulationVisualizer:
         Returns:
             plt.Figure: The matplotlib figure.
         """
-        fig, ax = plt.subplots(figsize=(12, 8))
+        _ensure_np(results)
+        fig, ax = plt.subplots(figsize=(12, 8), constrained_layout=True)
 
+        # All histories are drawn as one LineCollection artist instead of a Line2D per strategy
+        segments, names = [], []
         for result in results:
             price_history = result.get('price_history', [])
-            if price_history:
-                steps = range(len(price_history))
-                ax.plot(steps, price_history, label=result['airdrop_strategy_name'], alpha=0.7)
+            if len(price_history) > 0:
+                segments.append(np.column_stack((np.arange(len(price_history)), price_history)))
+                names.append(result['airdrop_strategy_name'])
+        cycle_colors = plt.rcParams['axes.prop_cycle'].by_key()['color']
+        colors = [cycle_colors[i % len(cycle_colors)] for i in range(len(segments))]
+        ax.add_collection(LineCollection(segments, colors=colors, alpha=0.7, rasterized=True))
+        ax.autoscale_view()
 
         ax.set_xlabel('Simulation Steps')
         ax.set_ylabel('Token Price ($)')
         ax.set_title('Price History Comparison')
-        ax.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
+        # Proxy artists stand in for the individual lines in the legend. The figure keeps its size
+        # when saved, so long legends wrap into extra columns instead of squashing the plot
+        handles = [Line2D([], [], color=color, alpha=0.7, label=name) for color, name in zip(colors, names)]
+        ax.legend(handles=handles, bbox_to_anchor=(1.05, 1), loc='upper left', ncol=1 + len(handles) // 25)
         ax.grid(True, alpha=0.3)
 
         if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
-        plt.tight_layout()
+            plt.savefig(save_path, dpi=REPORT_DPI)
         return fig
 
     def plot_final_prices_comparison(self, results: List[Dict[str, Any]], save_path: Optional[str] = None) -> plt.Figure:
@@ -74,12 +140,12 @@ class SimulationVisualizer:
         Returns:
             plt.Figure: The matplotlib figure.
         """
-        df = pd.DataFrame(results)
+        df = self._df(results)
         df = df.sort_values('final_price', ascending=False)
 
-        fig, ax = plt.subplots(figsize=(14, 8))
+        fig, ax = plt.subplots(figsize=(14, 8), constrained_layout=True)
 
-        bars = ax.bar(range(len(df)), df['final_price'], color=plt.cm.viridis(np.linspace(0, 1, len(df))))
+        bars = ax.bar(range(len(df)), df['final_price'], color=_viridis(len(df)))
 
         ax.set_xlabel('Strategy')
         ax.set_ylabel('Final Price ($)')
@@ -93,8 +159,7 @@ class SimulationVisualizer:
                     f'${price:.4f}', ha='center', va='bottom', fontsize=9)
 
         if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
-        plt.tight_layout()
+            plt.savefig(save_path, dpi=REPORT_DPI)
         return fig
 
     def plot_supply_impact(self, results: List[Dict[str, Any]], save_path: Optional[str] = None) -> plt.Figure:
@@ -108,20 +173,19 @@ class SimulationVisualizer:
         Returns:
             plt.Figure: The matplotlib figure.
         """
-        df = pd.DataFrame(results)
+        df = self._df(results)
 
-        fig, ax = plt.subplots(figsize=(10, 8))
+        fig, ax = plt.subplots(figsize=(10, 8), constrained_layout=True)
 
         scatter = ax.scatter(df['final_supply'], df['final_price'],
                            c=df['final_price'], cmap='viridis',
-                           s=100, alpha=0.7, edgecolors='black')
+                           s=100, alpha=0.7, edgecolors='black', rasterized=True)
 
-        # Add strategy labels for outliers
-        for _, row in df.iterrows():
-            if row['final_price'] > df['final_price'].quantile(0.8) or row['final_price'] < df['final_price'].quantile(0.2):
-                ax.annotate(row['airdrop_strategy_name'][:15] + '...',
-                           (row['final_supply'], row['final_price']),
-                           xytext=(5, 5), textcoords='offset points', fontsize=8)
+        # Add strategy labels for outliers, selected with one mask instead of per-row quantiles
+        low, high = df['final_price'].quantile([0.2, 0.8])
+        outliers = df[(df['final_price'] > high) | (df['final_price'] < low)]
+        for name, supply, price in zip(outliers['airdrop_strategy_name'].to_numpy(), outliers['final_supply'].to_numpy(), outliers['final_price'].to_numpy()):
+            ax.annotate(name[:15] + '...', (supply, price), xytext=(5, 5), textcoords='offset points', fontsize=8)
 
         ax.set_xlabel('Final Supply')
         ax.set_ylabel('Final Price ($)')
@@ -129,8 +193,7 @@ class SimulationVisualizer:
         plt.colorbar(scatter, ax=ax, label='Final Price ($)')
 
         if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
-        plt.tight_layout()
+            plt.savefig(save_path, dpi=REPORT_DPI)
         return fig
 
     def create_strategy_comparison_table(self, results: List[Dict[str, Any]], save_path: Optional[str] = None) -> pd.DataFrame:
@@ -144,17 +207,18 @@ class SimulationVisualizer:
         Returns:
             pd.DataFrame: The comparison table.
         """
-        df = pd.DataFrame(results)
+        df = self._df(results)
 
         # Extract strategy parameters for comparison
         strategy_details = []
         for result in results:
-            strategy_str = result.get('strategy_details', '{}')
-            # Simple parsing of strategy string - in production, you'd want more robust parsing
+            strategy_str = result.get('strategy_details')
+            if strategy_str is None:
+                # Results recorded with strategy columns instead of the full strategy string
+                strategy_str = f"{result.get('strategy_type', 'N/A')}, {result.get('vesting_type', 'N/A')} vesting, {result.get('percentage', 0) * 100:.1f}%"
             strategy_details.append(strategy_str)
 
-        df['strategy_summary'] = strategy_details
-        df = df[['airdrop_strategy_name', 'final_price', 'final_supply', 'strategy_summary']]
+        df = df[['airdrop_strategy_name', 'final_price', 'final_supply']].assign(strategy_summary=strategy_details)
         df = df.sort_values('final_price', ascending=False)
 
         if save_path:
@@ -170,7 +234,7 @@ class SimulationVisualizer:
             results (List[Dict[str, Any]]): Simulation results.
             output_file (str): Path to save the dashboard.
         """
-        df = pd.DataFrame(results)
+        df = self._df(results)
 
         # Create subplots
         fig = make_subplots(
@@ -197,14 +261,25 @@ class SimulationVisualizer:
         )
 
         # 3. Price History (using first few strategies as example)
+        # All histories go into one WebGL trace, separated by NaN gaps. Markers are coloured by
+        # strategy so the histories stay distinguishable; hovering shows the strategy name
+        _ensure_np(results)
+        xs, ys, names, strategy_indices = [], [], [], []
         for i, result in enumerate(results[:5]):  # Show first 5 strategies
             price_history = result.get('price_history', [])
-            if price_history:
-                steps = list(range(len(price_history)))
-                fig.add_trace(
-                    go.Scatter(x=steps, y=price_history, mode='lines', name=result['airdrop_strategy_name'][:20]),
-                    row=2, col=1
-                )
+            if len(price_history) > 0:
+                xs.extend((np.arange(len(price_history)), [np.nan]))
+                ys.extend((price_history, [np.nan]))
+                names.extend([result['airdrop_strategy_name'][:20]] * (len(price_history) + 1))
+                strategy_indices.append(np.full(len(price_history) + 1, i))
+        if names:
+            fig.add_trace(
+                go.Scattergl(x=np.concatenate(xs), y=np.concatenate(ys), mode='lines+markers', name='Price History',
+                             line=dict(color='lightgray', width=1),
+                             marker=dict(color=np.concatenate(strategy_indices), colorscale='Viridis', size=3),
+                             text=names, hovertemplate='%{text}<br>Step %{x}: $%{y:.4f}<extra></extra>'),
+                row=2, col=1
+            )
 
         # 4. Strategy Performance Table
         df_table = df[['airdrop_strategy_name', 'final_price', 'final_supply']].copy()
@@ -242,14 +317,14 @@ class SimulationVisualizer:
         Returns:
             plt.Figure: The matplotlib figure.
         """
-        df = pd.DataFrame(results)
+        df = self._df(results)
 
-        # Extract parameters from strategy details (simplified parsing)
-        df['strategy_type'] = df['strategy_details'].str.extract(r"'type':\s*'([^']*)'")
-        df['vesting_type'] = df['strategy_details'].str.extract(r"'vesting':\s*'([^']*)'")
-        df['percentage'] = df['strategy_details'].str.extract(r"'percentage':\s*([\d.]+)").astype(float)
+        # Current runs record these as columns; only results files from older runs need parsing
+        if 'strategy_type' not in df.columns:
+            fields = df['strategy_details'].str.extract(_STRATEGY_FIELDS_PATTERN)
+            df = df.assign(strategy_type=fields['strategy_type'], vesting_type=fields['vesting_type'], percentage=fields['percentage'].astype(float))
 
-        fig, axes = plt.subplots(2, 2, figsize=(15, 12))
+        fig, axes = plt.subplots(2, 2, figsize=(15, 12), constrained_layout=True)
         axes = axes.flatten()
 
         # Strategy type impact
@@ -274,10 +349,8 @@ class SimulationVisualizer:
         # Hide unused subplot
         axes[3].set_visible(False)
 
-        plt.tight_layout()
-
         if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
+            plt.savefig(save_path, dpi=REPORT_DPI)
 
         return fig
 
@@ -310,7 +383,7 @@ def generate_comprehensive_report(results: List[Dict[str, Any]], output_dir: str
     visualizer.generate_interactive_dashboard(results, f"{output_dir}interactive_dashboard.html")
 
     # Generate summary statistics
-    df = pd.DataFrame(results)
+    df = visualizer._df(results)
     summary_stats = df[['final_price', 'final_supply']].describe()
 
     with open(f"{output_dir}summary_report.txt", 'w') as f: